@@ -1,23 +1,85 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import json
 from app.database.postgres import get_db
-from app.schemas.search import SearchRequest, SearchResponse
+from app.schemas.search import SearchRequest, SearchResponse, SearchBatchRequest, SearchBatchResponse
+from app.services.lexical_index import LexicalIndexUnavailable
 from app.services.tool_service import tool_service
+from app.config.settings import settings
 
 router = APIRouter(prefix="/search", tags=["search"])
 
 
 @router.post("/", response_model=SearchResponse)
-def search_tools(search_request: SearchRequest, db: Session = Depends(get_db)):
-    results, response_time = tool_service.search_tools(
-        db, 
-        search_request.query, 
-        search_request.limit
-    )
+async def search_tools(search_request: SearchRequest, db: AsyncSession = Depends(get_db)):
+    try:
+        results, response_time, reranked = await tool_service.search_tools(
+            db, 
+            search_request.query, 
+            search_request.limit,
+            search_request.filters,
+            search_request.mode,
+            search_request.rerank
+        )
+    except LexicalIndexUnavailable as error:
+        raise HTTPException(status_code=503, detail=str(error))
     
     return SearchResponse(
         query=search_request.query,
         results=results,
         result_count=len(results),
-        response_time_ms=response_time
+        response_time_ms=response_time,
+        reranked=reranked
+    )
+
+
+@router.post("/stream")
+async def search_tools_stream(search_request: SearchRequest):
+    try:
+        tool_service.resolve_mode(search_request.mode)
+    except LexicalIndexUnavailable as error:
+        raise HTTPException(status_code=503, detail=str(error))
+    
+    events = tool_service.search_tools_stream(
+        search_request.query,
+        search_request.limit,
+        search_request.filters,
+        search_request.mode,
+        search_request.rerank
+    )
+    
+    async def lines():
+        async for event in events:
+            yield json.dumps(jsonable_encoder(event)) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/batch", response_model=SearchBatchResponse)
+async def search_tools_batch(batch_request: SearchBatchRequest, db: AsyncSession = Depends(get_db)):
+    if len(batch_request.searches) > settings.SEARCH_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=422,
+            detail=f"A batch can contain at most {settings.SEARCH_BATCH_MAX_SIZE} searches"
+        )
+    
+    try:
+        responses, total_response_time = await tool_service.search_tools_batch(db, batch_request.searches)
+    except LexicalIndexUnavailable as error:
+        raise HTTPException(status_code=503, detail=str(error))
+    
+    return SearchBatchResponse(
+        responses=[
+            SearchResponse(
+                query=search_request.query,
+                results=results,
+                result_count=len(results),
+                response_time_ms=response_time,
+                reranked=reranked
+            )
+            for search_request, (results, response_time, reranked) in zip(batch_request.searches, responses)
+        ],
+        total_response_time_ms=total_response_time
     )
\ No newline at end of file
@@ -1,16 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import json
+from app.config.settings import settings
 from app.database.postgres import get_db
-from app.schemas.tool import ToolCreate, ToolUpdate, ToolResponse
-from app.services.tool_service import tool_service
+from app.schemas.tool import ToolCreate, ToolUpdate, ToolResponse, ToolBulkCreate, ToolBulkResponse
+from app.services.pagination import InvalidCursor, decode_cursor
+from app.services.tool_service import TOOL_FIELDS, tool_service
 
 router = APIRouter(prefix="/tools", tags=["tools"])
 
 
 @router.post("/", response_model=ToolResponse)
-def create_tool(tool: ToolCreate, db: Session = Depends(get_db)):
-    created_tool = tool_service.create_tool(db, tool)
+async def create_tool(tool: ToolCreate, db: AsyncSession = Depends(get_db)):
+    created_tool = await tool_service.create_tool(db, tool)
     return ToolResponse(
         id=created_tool.id,
         name=created_tool.name,
@@ -23,27 +28,65 @@ def create_tool(tool: ToolCreate, db: Session = Depends(get_db)):
     )
 
 
+@router.post("/bulk", response_model=ToolBulkResponse)
+async def create_tools_bulk(bulk: ToolBulkCreate, db: AsyncSession = Depends(get_db)):
+    created_tools, stats = await tool_service.create_tools_bulk(db, bulk.tools)
+    return ToolBulkResponse(
+        created=len(created_tools),
+        ids=[tool.id for tool in created_tools],
+        elapsed_ms=int(stats.elapsed_seconds * 1000),
+        tools_per_second=stats.tools_per_second
+    )
+
+
+def parse_fields(fields: Optional[str]):
+    if not fields:
+        return None
+    selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in TOOL_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
 @router.get("/", response_model=List[ToolResponse])
-def get_tools(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    tools = tool_service.get_all_tools(db, skip, limit)
-    return [
-        ToolResponse(
-            id=tool.id,
-            name=tool.name,
-            description=tool.description,
-            tags=tool.tags,
-            metadata=tool.metadata_,
-            vector_id=tool.vector_id,
-            created_at=tool.created_at,
-            updated_at=tool.updated_at
-        )
-        for tool in tools
-    ]
+async def get_tools(
+    response: Response,
+    limit: int = Query(100, ge=0),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    selected = parse_fields(fields)
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except InvalidCursor as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    
+    limit = min(limit, settings.TOOLS_PAGE_MAX_SIZE)
+    tools, next_cursor = await tool_service.get_tools_page(db, limit, position, selected, skip)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    if selected:
+        return JSONResponse(jsonable_encoder(tools), headers=headers)
+    response.headers.update(headers)
+    return tools
+
+
+@router.get("/export")
+async def export_tools(fields: Optional[str] = None):
+    selected = parse_fields(fields)
+    
+    async def lines():
+        async for tools in tool_service.export_tools(selected):
+            yield "".join(json.dumps(jsonable_encoder(tool)) + "\n" for tool in tools)
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{tool_id}", response_model=ToolResponse)
-def get_tool(tool_id: str, db: Session = Depends(get_db)):
-    tool = tool_service.get_tool(db, tool_id)
+async def get_tool(tool_id: str, db: AsyncSession = Depends(get_db)):
+    tool = await tool_service.get_tool(db, tool_id)
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
     return ToolResponse(
@@ -59,8 +102,8 @@ def get_tool(tool_id: str, db: Session = Depends(get_db)):
 
 
 @router.put("/{tool_id}", response_model=ToolResponse)
-def update_tool(tool_id: str, tool: ToolUpdate, db: Session = Depends(get_db)):
-    updated_tool = tool_service.update_tool(db, tool_id, tool)
+async def update_tool(tool_id: str, tool: ToolUpdate, db: AsyncSession = Depends(get_db)):
+    updated_tool = await tool_service.update_tool(db, tool_id, tool)
     if not updated_tool:
         raise HTTPException(status_code=404, detail="Tool not found")
     return ToolResponse(
@@ -76,8 +119,8 @@ def update_tool(tool_id: str, tool: ToolUpdate, db: Session = Depends(get_db)):
 
 
 @router.delete("/{tool_id}")
-def delete_tool(tool_id: str, db: Session = Depends(get_db)):
-    success = tool_service.delete_tool(db, tool_id)
+async def delete_tool(tool_id: str, db: AsyncSession = Depends(get_db)):
+    success = await tool_service.delete_tool(db, tool_id)
     if not success:
         raise HTTPException(status_code=404, detail="Tool not found")
     return {"message": "Tool deleted successfully"}
\ No newline at end of file
@@ -8,10 +8,21 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
+    DATABASE_URL: Optional[str] = None
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: bool = True
 
     QDRANT_HOST: str
     QDRANT_PORT: int
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_POOL_SIZE: int = 0
     QDRANT_COLLECTION_NAME: str
+    QDRANT_PAYLOAD_INDEXES: str = "tags:keyword,metadata.category:keyword,metadata.difficulty:keyword,metadata.popularity:float"
 
     PGADMIN_EMAIL: str
     PGADMIN_PASSWORD: str
@@ -19,10 +30,92 @@ class Settings(BaseSettings):
 
     EMBEDDING_MODEL: str
     VECTOR_SIZE: int
+    EMBEDDING_TRUNCATE_DIM: Optional[int] = None
+
+    VECTOR_QUANTIZATION: str = "none"
+    VECTOR_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_ON_DISK: bool = False
+    SEARCH_RESCORE: bool = True
+    SEARCH_OVERSAMPLING: float = 2.0
+
+    VECTOR_STORE_BACKEND: str = "qdrant"
+    VECTOR_STORE_INDEX: str = "exact"
+    VECTOR_STORE_IVF_NLIST: int = 1024
+    VECTOR_STORE_IVF_NPROBE: int = 32
+    VECTOR_STORE_SNAPSHOT_PATH: Optional[str] = None
+
+    EMBEDDING_CACHE_SIZE: int = 10000
+    EMBEDDING_CACHE_TTL_SECONDS: int = 0
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+    EMBEDDING_STORE_ENABLED: bool = True
+
+    EMBEDDING_EXECUTOR_WORKERS: int = 2
+
+    EMBEDDING_BACKEND: str = "torch"
+    EMBEDDING_ONNX_PATH: str = "./models/onnx"
+    EMBEDDING_ONNX_QUANTIZED: bool = False
+    EMBEDDING_INTRA_OP_THREADS: int = 0
+
+    EMBEDDING_SERVER_ADDRESS: str = "/tmp/tool-search-embeddings/embeddings.sock"
+    EMBEDDING_SERVER_AUTHKEY: Optional[str] = None
+    EMBEDDING_SERVER_BACKEND: str = "torch"
+
+    EMBEDDING_BATCHING_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_SIZE: int = 32
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 2
 
     API_HOST: str
     API_PORT: int
 
+    INGEST_CHUNK_SIZE: int = 256
+    INGEST_UPSERT_BATCH_SIZE: int = 64
+    INGEST_MAX_PARALLEL_UPSERTS: int = 4
+
+    REINDEX_OVERLAP_SECONDS: int = 60
+
+    TOOLS_PAGE_MAX_SIZE: int = 1000
+    TOOLS_EXPORT_CHUNK_SIZE: int = 1000
+
+    LEXICAL_INDEX_ENABLED: bool = True
+    LEXICAL_INDEX_REFRESH_SECONDS: int = 30
+    BM25_K1: float = 1.5
+    BM25_B: float = 0.75
+    HYBRID_CANDIDATES: int = 50
+    RRF_K: int = 60
+
+    RERANK_ENABLED: bool = False
+    RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANK_CANDIDATES: int = 30
+    RERANK_TIMEOUT_MS: int = 150
+    RERANK_CACHE_SIZE: int = 10000
+    RERANK_MAX_PENDING: int = 2
+
+    SEARCH_HYDRATE_FROM_PAYLOAD: bool = True
+    SEARCH_CACHE_SIZE: int = 1000
+    SEARCH_CACHE_TTL_SECONDS: int = 60
+    SEARCH_BATCH_MAX_SIZE: int = 100
+    SEARCH_MAX_LIMIT: int = 100
+
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = False
+
+    SEARCH_HISTORY_STORE_PAYLOADS: bool = True
+    SEARCH_HISTORY_QUEUE_SIZE: int = 10000
+    SEARCH_HISTORY_BATCH_SIZE: int = 500
+    SEARCH_HISTORY_FLUSH_INTERVAL_MS: int = 1000
+    SEARCH_HISTORY_BACKPRESSURE_RATIO: float = 0.8
+    SEARCH_HISTORY_BACKPRESSURE_SAMPLE_RATE: float = 0.1
+
+    VECTOR_OUTBOX_WORKER_ENABLED: bool = True
+    VECTOR_OUTBOX_BATCH_SIZE: int = 100
+    VECTOR_OUTBOX_POLL_INTERVAL_MS: int = 500
+    VECTOR_OUTBOX_MAX_ATTEMPTS: int = 10
+    VECTOR_OUTBOX_RETRY_BACKOFF_SECONDS: float = 1.0
+
+    @property
+    def vector_dimension(self):
+        return self.EMBEDDING_TRUNCATE_DIM or self.VECTOR_SIZE
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,18 +1,48 @@
-from sqlalchemy import create_engine
+import asyncio
+import logging
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config.settings import settings
 
-DATABASE_URL = f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+logger = logging.getLogger(__name__)
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+ASYNC_DATABASE_URL = settings.DATABASE_URL or f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+DATABASE_URL = make_url(ASYNC_DATABASE_URL).set(drivername=make_url(ASYNC_DATABASE_URL).get_backend_name())
+
+engine = create_engine(
+    DATABASE_URL,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+
+async def warm_up_pool(size: int = settings.DB_POOL_SIZE):
+    results = await asyncio.gather(*(async_engine.connect() for _ in range(size)), return_exceptions=True)
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    failures = [result for result in results if isinstance(result, BaseException)]
+    await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+    if failures:
+        logger.warning(
+            "Opened %d of %d database connections while warming up the pool",
+            len(connections), size, exc_info=failures[0]
+        )
\ No newline at end of file
@@ -1,21 +1,125 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+import time
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CreateAlias,
+    CreateAliasOperation,
+    Distance,
+    PayloadSchemaType,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams
+)
 from app.config.settings import settings
 
 
+def qdrant_client_options():
+    options = {
+        "host": settings.QDRANT_HOST,
+        "port": settings.QDRANT_PORT,
+        "grpc_port": settings.QDRANT_GRPC_PORT,
+        "prefer_grpc": settings.QDRANT_PREFER_GRPC
+    }
+    if settings.QDRANT_POOL_SIZE > 0:
+        options["pool_size"] = settings.QDRANT_POOL_SIZE
+    return options
+
+
 def get_qdrant_client():
-    client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
+    client = QdrantClient(**qdrant_client_options())
     return client
 
 
-def initialize_collection():
-    client = get_qdrant_client()
-    
-    collections = client.get_collections().collections
-    collection_names = [collection.name for collection in collections]
+def get_async_qdrant_client():
+    client = AsyncQdrantClient(**qdrant_client_options())
+    return client
+
+
+def versioned_collection_name(alias: str):
+    return f"{alias}_v{time.strftime('%Y%m%d%H%M%S')}"
+
+
+def parse_payload_indexes(spec: str):
+    indexes = {}
+    for item in spec.split(","):
+        field_name, _, field_schema = item.strip().partition(":")
+        if field_name:
+            indexes[field_name] = PayloadSchemaType(field_schema or "keyword")
+    return indexes
+
+
+async def ensure_payload_indexes(client: AsyncQdrantClient, collection_name: str):
+    existing = (await client.get_collection(collection_name)).payload_schema or {}
+    for field_name, field_schema in parse_payload_indexes(settings.QDRANT_PAYLOAD_INDEXES).items():
+        if field_name not in existing or existing[field_name].data_type != field_schema:
+            await client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+                wait=True
+            )
+
+
+def build_quantization_config(mode: str):
+    if mode == "int8":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=settings.VECTOR_QUANTIZATION_ALWAYS_RAM
+            )
+        )
+    if mode == "binary":
+        return BinaryQuantization(
+            binary=BinaryQuantizationConfig(always_ram=settings.VECTOR_QUANTIZATION_ALWAYS_RAM)
+        )
+    return None
+
+
+async def create_tools_collection(client: AsyncQdrantClient, collection_name: str):
+    await client.create_collection(
+        collection_name=collection_name,
+        vectors_config=VectorParams(
+            size=settings.vector_dimension,
+            distance=Distance.COSINE,
+            on_disk=settings.VECTOR_ON_DISK
+        ),
+        quantization_config=build_quantization_config(settings.VECTOR_QUANTIZATION)
+    )
+    await ensure_payload_indexes(client, collection_name)
+
+
+async def resolve_alias(client: AsyncQdrantClient, alias: str):
+    aliases = (await client.get_aliases()).aliases
+    for description in aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    if await client.collection_exists(alias):
+        return alias
+    return None
+
+
+async def initialize_collection():
+    client = get_async_qdrant_client()
     
-    if settings.QDRANT_COLLECTION_NAME not in collection_names:
-        client.create_collection(
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            vectors_config=VectorParams(size=settings.VECTOR_SIZE, distance=Distance.COSINE)
-        )
\ No newline at end of file
+    try:
+        current = await resolve_alias(client, settings.QDRANT_COLLECTION_NAME)
+        if current is not None:
+            await ensure_payload_indexes(client, current)
+        else:
+            collection_name = versioned_collection_name(settings.QDRANT_COLLECTION_NAME)
+            await create_tools_collection(client, collection_name)
+            await client.update_collection_aliases(
+                change_aliases_operations=[
+                    CreateAliasOperation(
+                        create_alias=CreateAlias(
+                            collection_name=collection_name,
+                            alias_name=settings.QDRANT_COLLECTION_NAME
+                        )
+                    )
+                ]
+            )
+    finally:
+        await client.close()
\ No newline at end of file
@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.routes import tools, search
-from app.database.qdrant import initialize_collection
+from app.database.postgres import AsyncSessionLocal, async_engine, warm_up_pool
+from app.services.search_history_service import search_history_writer
+from app.services.embedding_service import embedding_service
+from app.services.embedding_store import embedding_store
+from app.services.vector_backend import vector_store
+from app.services.ingestion_service import ingestion_pipeline
+from app.services.lexical_index import lexical_index
+from app.services.rerank_service import rerank_service
+from app.services.search_cache import search_cache
+from app.services.vector_outbox import vector_outbox_worker
+from app.services.metrics import metrics, request_timings
 from app.config.settings import settings
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Tool Semantic Search API", version="1.0.0")
 
 app.add_middleware(
@@ -18,9 +34,118 @@ app.include_router(tools.router)
 app.include_router(search.router)
 
 
+async def server_timing(request: Request, call_next):
+    timings = {}
+    token = request_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_timings.reset(token)
+    if "content-length" not in response.headers:
+        return response
+    timings["total"] = time.perf_counter() - start
+    response.headers["Server-Timing"] = ", ".join(
+        f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items()
+    )
+    return response
+
+
+if settings.SERVER_TIMING_ENABLED:
+    app.middleware("http")(server_timing)
+
+
+def cache_stats():
+    caches = {"search": search_cache}
+    if embedding_service.cache is not None:
+        caches["embedding"] = embedding_service.cache
+    if embedding_store.enabled:
+        caches["embedding_store"] = embedding_store
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def pool_connections():
+    pool = async_engine.pool
+    return {"checked_out": pool.checkedout(), "idle": pool.checkedin(), "overflow": max(pool.overflow(), 0)}
+
+
+metrics.callback(
+    "tool_search_cache_hits_total", "Cache lookups that found an entry",
+    lambda: {name: stats["hits"] for name, stats in cache_stats().items()}, "counter", ("cache",)
+)
+metrics.callback(
+    "tool_search_cache_misses_total", "Cache lookups that missed",
+    lambda: {name: stats["misses"] for name, stats in cache_stats().items()}, "counter", ("cache",)
+)
+metrics.callback(
+    "tool_search_cache_hit_ratio", "Cache hit ratio since startup",
+    lambda: {name: stats["hit_ratio"] for name, stats in cache_stats().items()}, "gauge", ("cache",)
+)
+metrics.callback(
+    "tool_search_db_pool_connections", "Database pool connections by state", pool_connections, "gauge", ("state",)
+)
+metrics.callback("tool_search_db_pool_size", "Configured database pool size", lambda: async_engine.pool.size())
+metrics.callback(
+    "tool_search_history_queue_depth", "Search history records waiting to be written",
+    lambda: search_history_writer.queue.qsize()
+)
+metrics.callback(
+    "tool_search_history_dropped_total", "Search history records dropped",
+    lambda: search_history_writer.dropped, "counter"
+)
+metrics.callback(
+    "tool_search_rerank_timeouts_total", "Re-rank calls that exceeded the latency budget",
+    lambda: rerank_service.timeouts, "counter"
+)
+metrics.callback(
+    "tool_search_rerank_skipped_total", "Re-rank calls skipped while the model was loading or busy",
+    lambda: rerank_service.skipped, "counter"
+)
+metrics.callback(
+    "tool_search_vector_outbox_processed_total", "Vector outbox entries applied to the vector store",
+    lambda: vector_outbox_worker.processed, "counter"
+)
+metrics.callback(
+    "tool_search_vector_outbox_failures_total", "Vector outbox entries that failed and were rescheduled",
+    lambda: vector_outbox_worker.failures, "counter"
+)
+
+
+async def restore_vector_store():
+    try:
+        async with AsyncSessionLocal() as db:
+            await ingestion_pipeline.restore_vectors(db)
+        vector_store.ready = True
+    except Exception:
+        logger.exception("Failed to restore the in-memory vector store")
+
+
 @app.on_event("startup")
 async def startup_event():
-    initialize_collection()
+    embedding_service.start()
+    if settings.DB_POOL_WARMUP:
+        try:
+            await warm_up_pool()
+        except Exception:
+            logger.exception("Failed to warm up the database connection pool")
+    await vector_store.start()
+    if settings.VECTOR_STORE_BACKEND == "memory":
+        app.state.restore_task = asyncio.create_task(restore_vector_store())
+    await lexical_index.start()
+    search_history_writer.start()
+    rerank_service.start()
+    await vector_outbox_worker.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await lexical_index.stop()
+    await vector_outbox_worker.stop()
+    search_history_writer.stop()
+    embedding_service.shutdown()
+    rerank_service.shutdown()
+    await vector_store.close()
+    await async_engine.dispose()
 
 
 @app.get("/")
@@ -33,6 +158,31 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/health/live")
+def liveness_check():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness_check(response: Response):
+    checks = {
+        "embedding_model": embedding_service.ready,
+        "vector_store": vector_store.ready,
+        "lexical_index": lexical_index.ready or not lexical_index.enabled
+    }
+    ready = all(checks.values())
+    if not ready:
+        response.status_code = 503
+    return {"status": "ready" if ready else "starting", "checks": checks}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=settings.API_HOST, port=settings.API_PORT)
\ No newline at end of file
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String, TIMESTAMP, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.database.postgres import Base
+
+
+class ReindexCheckpoint(Base):
+    __tablename__ = "reindex_checkpoints"
+
+    job_name = Column(String(255), primary_key=True)
+    model_fingerprint = Column(String(255), nullable=False)
+    last_updated_at = Column(TIMESTAMP(timezone=True))
+    last_id = Column(UUID(as_uuid=True))
+    completed_at = Column(TIMESTAMP(timezone=True))
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
\ No newline at end of file
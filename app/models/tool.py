@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, TIMESTAMP, ARRAY, text
+from sqlalchemy import Column, String, Text, TIMESTAMP, ARRAY, JSON, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.database.postgres import Base
 import uuid
@@ -10,8 +10,10 @@ class Tool(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
-    tags = Column(ARRAY(Text), default=[])
-    metadata_ = Column("metadata", JSONB, default={})
+    tags = Column(ARRAY(Text).with_variant(JSON, "sqlite"), default=[])
+    metadata_ = Column("metadata", JSONB().with_variant(JSON, "sqlite"), default={})
     vector_id = Column(String(255), unique=True)
+    content_hash = Column(String(64))
+    embedding_model = Column(String(255))
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
     updated_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
\ No newline at end of file
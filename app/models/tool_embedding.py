@@ -0,0 +1,11 @@
+from sqlalchemy import Column, LargeBinary, String, TIMESTAMP, text
+from app.database.postgres import Base
+
+
+class ToolEmbedding(Base):
+    __tablename__ = "tool_embeddings"
+
+    content_hash = Column(String(64), primary_key=True)
+    embedding_model = Column(String(255), primary_key=True)
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, TIMESTAMP, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.database.postgres import Base
+
+
+class VectorOutbox(Base):
+    __tablename__ = "vector_outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    tool_id = Column(UUID(as_uuid=True), nullable=False)
+    operation = Column(String(16), nullable=False)
+    point_id = Column(String(255), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    available_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"))
\ No newline at end of file
@@ -1,12 +1,30 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Dict, Literal, Optional, Union
 from datetime import datetime
 from uuid import UUID
+from app.config.settings import settings
+
+
+class RangeFilter(BaseModel):
+    gt: Optional[float] = None
+    gte: Optional[float] = None
+    lt: Optional[float] = None
+    lte: Optional[float] = None
+
+
+class SearchFilters(BaseModel):
+    tags_any: List[str] = []
+    tags_all: List[str] = []
+    metadata: Dict[str, Union[bool, int, str]] = {}
+    metadata_ranges: Dict[str, RangeFilter] = {}
 
 
 class SearchRequest(BaseModel):
     query: str
-    limit: int = 5
+    limit: int = Field(5, ge=1, le=settings.SEARCH_MAX_LIMIT)
+    filters: Optional[SearchFilters] = None
+    mode: Literal["vector", "hybrid", "lexical"] = "vector"
+    rerank: Optional[bool] = None
 
 
 class SearchResult(BaseModel):
@@ -25,4 +43,14 @@ class SearchResponse(BaseModel):
     query: str
     results: List[SearchResult]
     result_count: int
-    response_time_ms: int
\ No newline at end of file
+    response_time_ms: int
+    reranked: bool = False
+
+
+class SearchBatchRequest(BaseModel):
+    searches: List[SearchRequest]
+
+
+class SearchBatchResponse(BaseModel):
+    responses: List[SearchResponse]
+    total_response_time_ms: int
\ No newline at end of file
@@ -15,6 +15,17 @@ class ToolCreate(ToolBase):
     pass
 
 
+class ToolBulkCreate(BaseModel):
+    tools: List[ToolCreate]
+
+
+class ToolBulkResponse(BaseModel):
+    created: int
+    ids: List[UUID]
+    elapsed_ms: int
+    tools_per_second: float
+
+
 class ToolUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -0,0 +1,210 @@
+from datetime import timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    PointIdsList,
+    PointStruct
+)
+from app.database.qdrant import create_tools_collection, resolve_alias, versioned_collection_name
+from app.models.tool import Tool
+from app.services.embedding_service import embedding_service
+from app.services.ingestion_service import ingestion_pipeline, IngestionStats
+from app.services.qdrant_service import qdrant_service
+from app.services.search_cache import search_cache
+from app.services.tool_documents import build_content_hash, build_point_id
+from app.config.settings import settings
+
+
+class CollectionRebuilder:
+    def __init__(self):
+        self.alias = settings.QDRANT_COLLECTION_NAME
+        self.chunk_size = settings.INGEST_CHUNK_SIZE
+        self.overlap = timedelta(seconds=settings.REINDEX_OVERLAP_SECONDS)
+
+    @property
+    def client(self):
+        return qdrant_service.client
+
+    async def rebuild(self, db: AsyncSession, swap: bool = True, keep_old: bool = False, progress=None):
+        await self.ensure_alias()
+        collection_name = versioned_collection_name(self.alias)
+        await create_tools_collection(self.client, collection_name)
+
+        started_at = await db.scalar(select(func.now()))
+        stats = IngestionStats(total=await db.scalar(select(func.count()).select_from(Tool)))
+        await self._fill(db, collection_name, stats, progress)
+        await self._catch_up(db, collection_name, started_at)
+        await self.verify(db, collection_name)
+
+        if swap:
+            await self.swap(db, collection_name, keep_old=keep_old)
+        return collection_name, stats
+
+    async def swap(self, db: AsyncSession, collection_name: str, keep_old: bool = False):
+        previous = await self.ensure_alias()
+        swap_started_at = await db.scalar(select(func.now()))
+
+        operations = []
+        if previous:
+            operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=self.alias)))
+        operations.append(
+            CreateAliasOperation(create_alias=CreateAlias(collection_name=collection_name, alias_name=self.alias))
+        )
+        await self.client.update_collection_aliases(change_aliases_operations=operations)
+
+        await self._catch_up(db, collection_name, swap_started_at)
+        await self.prune_orphans(db, collection_name)
+        await self.record_index_state(db)
+        search_cache.invalidate()
+
+        if not keep_old:
+            await self.garbage_collect(keep=collection_name)
+
+    async def ensure_alias(self):
+        current = await resolve_alias(self.client, self.alias)
+        if current == self.alias:
+            raise RuntimeError(
+                f"{self.alias} is a collection, not an alias; run python rebuild_collection.py --migrate-legacy first"
+            )
+        return current
+
+    async def migrate_legacy_collection(self, db: AsyncSession):
+        if await resolve_alias(self.client, self.alias) != self.alias:
+            return None
+
+        collection_name = versioned_collection_name(self.alias)
+        await create_tools_collection(self.client, collection_name)
+        started_at = await db.scalar(select(func.now()))
+        await self._copy_points(self.alias, collection_name)
+
+        await self.client.delete_collection(self.alias)
+        await self.client.update_collection_aliases(change_aliases_operations=[
+            CreateAliasOperation(create_alias=CreateAlias(collection_name=collection_name, alias_name=self.alias))
+        ])
+
+        await self._catch_up(db, collection_name, started_at)
+        await self.prune_orphans(db, collection_name)
+        await self.record_index_state(db)
+        search_cache.invalidate()
+        return collection_name
+
+    async def verify(self, db: AsyncSession, collection_name: str):
+        tool_ids = await self.prune_orphans(db, collection_name)
+
+        point_count = (await self.client.count(collection_name=collection_name, exact=True)).count
+        if point_count != len(tool_ids):
+            raise RuntimeError(
+                f"Collection {collection_name} has {point_count} points but the tools table has "
+                f"{len(tool_ids)} rows; keeping the current alias target"
+            )
+
+    async def prune_orphans(self, db: AsyncSession, collection_name: str):
+        tool_ids = {str(tool_id) for tool_id in (await db.execute(select(Tool.id))).scalars()}
+
+        orphan_ids = []
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=collection_name,
+                limit=self.chunk_size,
+                offset=offset,
+                with_payload=["id"],
+                with_vectors=False
+            )
+            orphan_ids.extend(point.id for point in points if point.payload.get("id") not in tool_ids)
+            if offset is None:
+                break
+
+        if orphan_ids:
+            await self.client.delete(
+                collection_name=collection_name,
+                points_selector=PointIdsList(points=orphan_ids)
+            )
+        return tool_ids
+
+    async def record_index_state(self, db: AsyncSession):
+        last_id = None
+        while True:
+            query = select(Tool).order_by(Tool.id).limit(self.chunk_size)
+            if last_id is not None:
+                query = query.where(Tool.id > last_id)
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            stale = [
+                tool for tool in tools
+                if not tool.vector_id
+                or tool.content_hash != build_content_hash(tool)
+                or tool.embedding_model != embedding_service.fingerprint
+            ]
+            if stale:
+                await ingestion_pipeline.record_indexed(
+                    db, stale, [tool.vector_id or build_point_id(tool.id) for tool in stale]
+                )
+                await db.commit()
+            last_id = tools[-1].id
+
+    async def garbage_collect(self, keep: str):
+        prefix = f"{self.alias}_v"
+        collections = (await self.client.get_collections()).collections
+        for collection in collections:
+            if collection.name.startswith(prefix) and collection.name != keep:
+                await self.client.delete_collection(collection.name)
+
+    async def _fill(self, db: AsyncSession, collection_name: str, stats: IngestionStats, progress):
+        last_id = None
+        while True:
+            query = select(Tool).order_by(Tool.id).limit(self.chunk_size)
+            if last_id is not None:
+                query = query.where(Tool.id > last_id)
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            await ingestion_pipeline.index_tools(db, tools, collection_name=collection_name, record=False)
+            last_id = tools[-1].id
+
+            stats.processed += len(tools)
+            stats.chunks += 1
+            if progress:
+                progress(stats)
+
+    async def _copy_points(self, source: str, target: str):
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=source,
+                limit=self.chunk_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            if points:
+                await self.client.upsert(
+                    collection_name=target,
+                    points=[PointStruct(id=point.id, vector=point.vector, payload=point.payload) for point in points]
+                )
+            if offset is None:
+                break
+
+    async def _catch_up(self, db: AsyncSession, collection_name: str, since):
+        since = since - self.overlap
+        last_id = None
+        while True:
+            query = select(Tool).where(Tool.updated_at >= since).order_by(Tool.id).limit(self.chunk_size)
+            if last_id is not None:
+                query = query.where(Tool.id > last_id)
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            await ingestion_pipeline.index_tools(db, tools, collection_name=collection_name, record=False)
+            last_id = tools[-1].id
+
+
+collection_rebuilder = CollectionRebuilder()
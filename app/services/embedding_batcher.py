@@ -0,0 +1,96 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from app.services.metrics import observe_batch
+
+
+class EmbeddingBatcher:
+    def __init__(self, encode_batch, max_batch_size: int = 32, max_wait_ms: float = 2):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.batched_items = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, text: str) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str):
+        return self.submit(text).result()
+
+    async def embed_async(self, text: str):
+        return await asyncio.wrap_future(self.submit(text))
+
+    def stop(self):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_started(self):
+        if self._thread:
+            return
+        with self._lock:
+            if self._thread:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="embedding-batcher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._encode(batch)
+            if stopping:
+                return
+
+    def _encode(self, batch: list):
+        pending = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+
+        self.batches += 1
+        self.batched_items += len(pending)
+        observe_batch("embedding", len(pending))
+        try:
+            embeddings = self.encode_batch([text for text, _ in pending])
+        except Exception as exc:
+            for _, future in pending:
+                future.set_exception(exc)
+            return
+
+        for (_, future), embedding in zip(pending, embeddings):
+            future.set_result(embedding)
@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    def __init__(self, max_size: int, ttl_seconds: int = 0, path: str = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, model_name: str):
+        return model_name, " ".join(text.split())
+
+    def get(self, text: str, model_name: str):
+        key = self.make_key(text, model_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector, expires_at = entry
+            if expires_at and expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.tolist()
+
+    def set(self, text: str, model_name: str, vector):
+        key = self.make_key(text, model_name)
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            self._entries[key] = (np.asarray(vector, dtype=np.float32), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+    def save(self):
+        if not self.path:
+            return
+
+        now = time.time()
+        with self._lock:
+            entries = [
+                (key, vector, expires_at)
+                for key, (vector, expires_at) in self._entries.items()
+                if not expires_at or expires_at > now
+            ]
+        if not entries:
+            return
+
+        vectors = np.stack([vector for _, vector, _ in entries]).astype(np.float32)
+        keys = [
+            {"model": model_name, "text": text, "expires_at": expires_at}
+            for (model_name, text), _, expires_at in entries
+        ]
+
+        cache_path = self._file_path()
+        try:
+            with open(f"{cache_path}.tmp", "wb") as cache_file:
+                np.savez(cache_file, vectors=vectors, keys=np.array(json.dumps(keys)))
+            os.replace(f"{cache_path}.tmp", cache_path)
+        except OSError:
+            logger.exception("Failed to persist embedding cache to %s", self.path)
+
+    def load(self):
+        if not self.path:
+            return
+
+        cache_path = self._file_path()
+        if not os.path.exists(cache_path):
+            return
+
+        try:
+            with np.load(cache_path) as data:
+                vectors = data["vectors"]
+                keys = json.loads(str(data["keys"]))
+        except (OSError, ValueError, KeyError):
+            logger.exception("Failed to load embedding cache from %s", self.path)
+            return
+        if len(keys) != len(vectors):
+            logger.warning("Discarding embedding cache %s: %d keys for %d vectors", cache_path, len(keys), len(vectors))
+            return
+
+        now = time.time()
+        with self._lock:
+            for row in range(max(len(keys) - self.max_size, 0), len(keys)):
+                key = keys[row]
+                if key["expires_at"] and key["expires_at"] <= now:
+                    continue
+                self._entries[(key["model"], key["text"])] = (vectors[row], key["expires_at"])
+
+    def _file_path(self):
+        return f"{self.path}.npz"
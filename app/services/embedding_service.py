@@ -1,18 +1,176 @@
-from sentence_transformers import SentenceTransformer
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from app.config.settings import settings
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_batcher import EmbeddingBatcher
+
+logger = logging.getLogger(__name__)
+
+
+def load_embedding_model(backend: str = None):
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend == "remote":
+        from app.services.inference_server import RemoteEncoder
+
+        return RemoteEncoder(
+            settings.EMBEDDING_SERVER_ADDRESS,
+            authkey=settings.EMBEDDING_SERVER_AUTHKEY.encode() if settings.EMBEDDING_SERVER_AUTHKEY else None,
+            expected_fingerprint=model_fingerprint()
+        )
+
+    if backend == "onnx":
+        from app.services.onnx_encoder import OnnxEncoder
+
+        return OnnxEncoder(
+            settings.EMBEDDING_ONNX_PATH,
+            quantized=settings.EMBEDDING_ONNX_QUANTIZED,
+            intra_op_threads=settings.EMBEDDING_INTRA_OP_THREADS,
+            truncate_dim=settings.EMBEDDING_TRUNCATE_DIM
+        )
+
+    from sentence_transformers import SentenceTransformer
+
+    if settings.EMBEDDING_INTRA_OP_THREADS > 0:
+        import torch
+
+        torch.set_num_threads(settings.EMBEDDING_INTRA_OP_THREADS)
+    return SentenceTransformer(settings.EMBEDDING_MODEL, truncate_dim=settings.EMBEDDING_TRUNCATE_DIM)
+
+
+def model_fingerprint(backend: str = None):
+    backend = backend or settings.EMBEDDING_BACKEND
+    if backend == "remote":
+        backend = settings.EMBEDDING_SERVER_BACKEND
+    fingerprint = f"{settings.EMBEDDING_MODEL}:{settings.vector_dimension}"
+    if backend == "onnx" and settings.EMBEDDING_ONNX_QUANTIZED:
+        fingerprint += ":int8"
+    return fingerprint
 
 
 class EmbeddingService:
     def __init__(self):
-        self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
+        self.model_name = settings.EMBEDDING_MODEL
+        self.fingerprint = model_fingerprint()
+        self.ready = False
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._loading = None
+        remote = settings.EMBEDDING_BACKEND == "remote"
+        self.cache = None
+        if settings.EMBEDDING_CACHE_SIZE > 0 and not remote:
+            self.cache = EmbeddingCache(
+                max_size=settings.EMBEDDING_CACHE_SIZE,
+                ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+                path=settings.EMBEDDING_CACHE_PATH
+            )
+            self.cache.load()
+        self._executor = None
+        self.batcher = None
+        if settings.EMBEDDING_BATCHING_ENABLED and not remote:
+            self.batcher = EmbeddingBatcher(
+                self.encode,
+                max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+                max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+            )
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = load_embedding_model()
+        return self._model
+
+    def start(self):
+        if self._loading is None:
+            self._loading = self.executor.submit(self.warm_up)
+            self._loading.add_done_callback(self._log_load_failure)
+
+    def warm_up(self):
+        self.model.encode("warm up")
+        self.ready = True
+
+    def encode(self, texts):
+        return self.model.encode(texts)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+                thread_name_prefix="embedding"
+            )
+        return self._executor
 
     def generate_embedding(self, text: str):
-        embedding = self.model.encode(text)
+        if self.cache is not None:
+            cached = self.cache.get(text, self.fingerprint)
+            if cached is not None:
+                return cached
+
+        if self.batcher is not None:
+            embedding = self.batcher.embed(text)
+        else:
+            embedding = self.encode(text)
+        if self.cache is not None:
+            self.cache.set(text, self.fingerprint, embedding)
+        return embedding.tolist()
+
+    async def generate_embedding_async(self, text: str):
+        if self.cache is not None:
+            cached = self.cache.get(text, self.fingerprint)
+            if cached is not None:
+                return cached
+
+        if self.batcher is not None:
+            embedding = await self.batcher.embed_async(text)
+        else:
+            loop = asyncio.get_running_loop()
+            embedding = await loop.run_in_executor(self.executor, self.encode, text)
+        if self.cache is not None:
+            self.cache.set(text, self.fingerprint, embedding)
         return embedding.tolist()
 
     def generate_embeddings_batch(self, texts: list):
-        embeddings = self.model.encode(texts)
+        embeddings = self.encode(texts)
         return [embedding.tolist() for embedding in embeddings]
 
+    async def generate_embeddings_batch_async(self, texts: list):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.generate_embeddings_batch, texts)
+
+    async def generate_query_embeddings_async(self, texts: list):
+        embeddings = [None] * len(texts)
+        if self.cache is not None:
+            embeddings = [self.cache.get(text, self.fingerprint) for text in texts]
+        
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = await self.generate_embeddings_batch_async([texts[index] for index in missing])
+            for index, embedding in zip(missing, encoded):
+                embeddings[index] = embedding
+                if self.cache is not None:
+                    self.cache.set(texts[index], self.fingerprint, embedding)
+        return embeddings
+
+    def save_cache(self):
+        if self.cache is not None:
+            self.cache.save()
+
+    def _log_load_failure(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._loading = None
+            logger.error("Failed to load embedding model %s", self.model_name, exc_info=future.exception())
+
+    def shutdown(self):
+        if self.batcher is not None:
+            self.batcher.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.save_cache()
+
 
-embedding_service = EmbeddingService()
\ No newline at end of file
+embedding_service = EmbeddingService()
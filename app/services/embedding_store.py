@@ -0,0 +1,63 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tool_embedding import ToolEmbedding
+from app.services.embedding_service import embedding_service
+from app.services.tool_documents import build_tool_text, build_content_hash
+from app.config.settings import settings
+
+
+def insert_ignoring_duplicates(db: AsyncSession):
+    dialect = sqlite if db.get_bind().dialect.name == "sqlite" else postgresql
+    return dialect.insert(ToolEmbedding).on_conflict_do_nothing()
+
+
+class EmbeddingStore:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    async def embed_tools(self, db: AsyncSession, tools: list):
+        if not self.enabled:
+            return await embedding_service.generate_embeddings_batch_async([build_tool_text(tool) for tool in tools])
+
+        fingerprint = embedding_service.fingerprint
+        hashes = [build_content_hash(tool) for tool in tools]
+        rows = await db.execute(
+            select(ToolEmbedding.content_hash, ToolEmbedding.vector)
+            .where(ToolEmbedding.embedding_model == fingerprint, ToolEmbedding.content_hash.in_(set(hashes)))
+        )
+        vectors = {content_hash: np.frombuffer(vector, dtype=np.float32).tolist() for content_hash, vector in rows}
+
+        texts = {}
+        for tool, content_hash in zip(tools, hashes):
+            if content_hash not in vectors:
+                texts.setdefault(content_hash, build_tool_text(tool))
+        if texts:
+            embeddings = await embedding_service.generate_embeddings_batch_async(list(texts.values()))
+            vectors.update(zip(texts, embeddings))
+            await db.execute(insert_ignoring_duplicates(db), [
+                {
+                    "content_hash": content_hash,
+                    "embedding_model": fingerprint,
+                    "vector": np.asarray(vectors[content_hash], dtype=np.float32).tobytes()
+                }
+                for content_hash in texts
+            ])
+
+        self.misses += len(texts)
+        self.hits += len(tools) - len(texts)
+        return [vectors[content_hash] for content_hash in hashes]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+embedding_store = EmbeddingStore(enabled=settings.EMBEDDING_STORE_ENABLED)
@@ -0,0 +1,192 @@
+import logging
+import os
+import queue
+import socket
+import stat
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener, answer_challenge, deliver_challenge
+import numpy as np
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_socket_path(address: str):
+    directory = os.path.dirname(address) or "."
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{directory} must be a directory owned by uid {os.getuid()} with mode 0700")
+
+    try:
+        info = os.lstat(address)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        raise RuntimeError(f"Refusing to replace {address}: it is not a socket owned by uid {os.getuid()}")
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(address)
+        except (ConnectionRefusedError, FileNotFoundError):
+            os.unlink(address)
+            return
+    raise RuntimeError(f"Another embedding server is already listening on {address}")
+
+
+class InferenceServer:
+    def __init__(self, address: str, model, fingerprint: str, cache: EmbeddingCache = None,
+                 batcher: EmbeddingBatcher = None, authkey: bytes = None):
+        if not authkey:
+            raise ValueError("The embedding server requires an authkey (EMBEDDING_SERVER_AUTHKEY)")
+        self.address = address
+        self.model = model
+        self.fingerprint = fingerprint
+        self.cache = cache
+        self.batcher = batcher
+        self.authkey = authkey
+        self._listener = None
+
+    def serve_forever(self):
+        prepare_socket_path(self.address)
+        self._listener = Listener(self.address, family="AF_UNIX")
+        os.chmod(self.address, 0o600)
+        logger.info("Serving %s embeddings on %s", self.fingerprint, self.address)
+        try:
+            while True:
+                try:
+                    connection = self._listener.accept()
+                except OSError:
+                    if self._listener is None:
+                        break
+                    logger.exception("Rejected embedding client connection")
+                    continue
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+        finally:
+            self.close()
+
+    def close(self):
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+        if self.batcher is not None:
+            self.batcher.stop()
+        if self.cache is not None:
+            self.cache.save()
+
+    def embed(self, texts):
+        if isinstance(texts, str):
+            return self._embed_one(texts)
+
+        embeddings = [self._cached(text) for text in texts]
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            encoded = self.model.encode([texts[index] for index in missing])
+            for index, embedding in zip(missing, encoded):
+                embeddings[index] = embedding
+                if self.cache is not None:
+                    self.cache.set(texts[index], self.fingerprint, embedding)
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _embed_one(self, text: str):
+        embedding = self._cached(text)
+        if embedding is None:
+            embedding = self.batcher.embed(text) if self.batcher is not None else self.model.encode(text)
+            if self.cache is not None:
+                self.cache.set(text, self.fingerprint, embedding)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _cached(self, text: str):
+        if self.cache is None:
+            return None
+        return self.cache.get(text, self.fingerprint)
+
+    def _authenticate(self, connection):
+        try:
+            deliver_challenge(connection, self.authkey)
+            answer_challenge(connection, self.authkey)
+        except (AuthenticationError, EOFError, OSError) as error:
+            logger.warning("Rejected embedding client connection: %r", error)
+            return False
+        return True
+
+    def _handle(self, connection):
+        with connection:
+            if not self._authenticate(connection):
+                return
+            while True:
+                try:
+                    command, argument = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if command == "info":
+                        connection.send(("ok", {"fingerprint": self.fingerprint}))
+                    elif command == "encode":
+                        connection.send(("ok", self.embed(argument)))
+                    else:
+                        connection.send(("error", f"unknown command {command!r}"))
+                except (EOFError, OSError):
+                    return
+                except Exception as error:
+                    logger.exception("Embedding request failed")
+                    connection.send(("error", repr(error)))
+
+
+class RemoteEncoder:
+    def __init__(self, address: str, authkey: bytes = None, expected_fingerprint: str = None):
+        if not authkey:
+            raise ValueError("The embedding server requires an authkey (EMBEDDING_SERVER_AUTHKEY)")
+        self.address = address
+        self.authkey = authkey
+        self.expected_fingerprint = expected_fingerprint
+        self._connections = queue.LifoQueue()
+
+    def encode(self, texts, **kwargs):
+        return self._request("encode", texts)
+
+    def close(self):
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+    def _request(self, command: str, argument=None):
+        for attempt in range(2):
+            connection = self._acquire()
+            try:
+                connection.send((command, argument))
+                status, value = connection.recv()
+            except (EOFError, OSError):
+                connection.close()
+                self.close()
+                if attempt:
+                    raise
+                continue
+            self._connections.put(connection)
+            if status != "ok":
+                raise RuntimeError(f"Embedding server error: {value}")
+            return value
+
+    def _acquire(self):
+        try:
+            return self._connections.get_nowait()
+        except queue.Empty:
+            pass
+
+        connection = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+        if self.expected_fingerprint is None:
+            return connection
+        try:
+            connection.send(("info", None))
+            status, info = connection.recv()
+            if status != "ok":
+                raise RuntimeError(f"Embedding server error: {info}")
+            if info["fingerprint"] != self.expected_fingerprint:
+                raise RuntimeError(
+                    f"Embedding server at {self.address} serves {info['fingerprint']}, "
+                    f"expected {self.expected_fingerprint}"
+                )
+        except BaseException:
+            connection.close()
+            raise
+        return connection
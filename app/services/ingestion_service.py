@@ -0,0 +1,189 @@
+import asyncio
+import time
+from uuid import uuid4
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tool import Tool
+from app.services.embedding_service import embedding_service
+from app.services.embedding_store import embedding_store
+from app.services.vector_backend import vector_store
+from app.services.tool_documents import build_tool_payload, build_content_hash, build_point_id
+from app.services.vector_outbox import enqueue_vector_write
+from app.config.settings import settings
+
+
+class IngestionStats:
+    def __init__(self, total: int = None):
+        self.total = total
+        self.processed = 0
+        self.removed = 0
+        self.chunks = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self):
+        return time.perf_counter() - self.started_at
+
+    @property
+    def tools_per_second(self):
+        elapsed = self.elapsed_seconds
+        return self.processed / elapsed if elapsed else 0.0
+
+    def __str__(self):
+        progress = f"{self.processed}/{self.total}" if self.total is not None else str(self.processed)
+        return f"{progress} tools in {self.elapsed_seconds:.1f}s ({self.tools_per_second:.1f} tools/s)"
+
+
+def chunked(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class IngestionPipeline:
+    def __init__(self):
+        self.chunk_size = settings.INGEST_CHUNK_SIZE
+        self.upsert_batch_size = settings.INGEST_UPSERT_BATCH_SIZE
+        self.max_parallel_upserts = settings.INGEST_MAX_PARALLEL_UPSERTS
+
+    async def ingest_tools(self, db: AsyncSession, tools_data, progress=None):
+        stats = IngestionStats(total=len(tools_data) if hasattr(tools_data, "__len__") else None)
+        created = []
+
+        for chunk in chunked(tools_data, self.chunk_size):
+            tool_ids = [uuid4() for _ in chunk]
+            rows = [
+                {
+                    "id": tool_id,
+                    "name": tool_data.name,
+                    "description": tool_data.description,
+                    "tags": tool_data.tags,
+                    "metadata_": tool_data.metadata,
+                    "vector_id": build_point_id(tool_id),
+                    "content_hash": build_content_hash(tool_data),
+                    "embedding_model": embedding_service.fingerprint
+                }
+                for tool_id, tool_data in zip(tool_ids, chunk)
+            ]
+            result = await db.execute(insert(Tool).returning(Tool, sort_by_parameter_order=True), rows)
+            tools = result.scalars().all()
+
+            for tool in tools:
+                enqueue_vector_write(db, tool.id, "upsert", tool.vector_id)
+            await db.commit()
+
+            created.extend(tools)
+            self._advance(stats, len(tools), progress)
+
+        return created, stats
+
+    async def sync_pending_tools(self, db: AsyncSession, progress=None):
+        total = await db.scalar(select(func.count()).select_from(Tool).where(Tool.vector_id.is_(None)))
+        stats = IngestionStats(total=total)
+
+        last_id = None
+        while True:
+            query = select(Tool).where(Tool.vector_id.is_(None)).order_by(Tool.id).limit(self.chunk_size)
+            if last_id is not None:
+                query = query.where(Tool.id > last_id)
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            await self.index_tools(db, tools)
+            last_id = tools[-1].id
+            self._advance(stats, len(tools), progress)
+
+        return stats
+
+    async def restore_vectors(self, db: AsyncSession, progress=None):
+        stats = IngestionStats()
+        indexed = set()
+
+        last_id = None
+        while True:
+            query = select(Tool).order_by(Tool.id).limit(self.chunk_size)
+            if last_id is not None:
+                query = query.where(Tool.id > last_id)
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            stored = await vector_store.get_payloads([tool.vector_id for tool in tools if tool.vector_id])
+            stale = [tool for tool in tools if stored.get(tool.vector_id) != build_tool_payload(tool)]
+            if stale:
+                await self.index_tools(db, stale)
+            indexed.update(tool.vector_id for tool in tools)
+            last_id = tools[-1].id
+            self._advance(stats, len(stale), progress)
+
+        async for points in vector_store.scroll_points(self.chunk_size):
+            candidates = [point_id for point_id, _ in points if point_id not in indexed]
+            if not candidates:
+                continue
+            known = set((await db.execute(
+                select(Tool.vector_id).where(Tool.vector_id.in_(candidates))
+            )).scalars())
+            orphans = [point_id for point_id in candidates if point_id not in known]
+            if orphans:
+                await vector_store.delete_vectors(orphans)
+                stats.removed += len(orphans)
+
+        return stats
+
+    async def index_tools(
+        self, db: AsyncSession, tools: list, commit: bool = True, collection_name: str = None, record: bool = True
+    ):
+        point_ids = [tool.vector_id or build_point_id(tool.id) for tool in tools]
+
+        await self._upsert_chunk(db, tools, point_ids, collection_name)
+        if record:
+            await self.record_indexed(db, tools, point_ids)
+        if commit:
+            await db.commit()
+
+    async def record_indexed(self, db: AsyncSession, tools: list, point_ids: list):
+        await db.execute(
+            update(Tool),
+            [
+                {
+                    "id": tool.id,
+                    "vector_id": point_id,
+                    "content_hash": build_content_hash(tool),
+                    "embedding_model": embedding_service.fingerprint
+                }
+                for tool, point_id in zip(tools, point_ids)
+            ]
+        )
+
+    async def _upsert_chunk(self, db: AsyncSession, tools: list, point_ids: list, collection_name: str = None):
+        embeddings = await embedding_store.embed_tools(db, tools)
+        semaphore = asyncio.Semaphore(self.max_parallel_upserts)
+
+        async def upsert_batch(start: int):
+            batch = tools[start:start + self.upsert_batch_size]
+            async with semaphore:
+                await vector_store.upsert_vectors(
+                    point_ids[start:start + self.upsert_batch_size],
+                    embeddings[start:start + self.upsert_batch_size],
+                    [build_tool_payload(tool) for tool in batch],
+                    collection_name
+                )
+
+        await asyncio.gather(*(
+            upsert_batch(start) for start in range(0, len(tools), self.upsert_batch_size)
+        ))
+
+    def _advance(self, stats: IngestionStats, count: int, progress):
+        stats.processed += count
+        stats.chunks += 1
+        if progress:
+            progress(stats)
+
+
+ingestion_pipeline = IngestionPipeline()
@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from datetime import timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.postgres import AsyncSessionLocal
+from app.models.tool import Tool
+from app.services.search_filters import matches_filters
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9_.+#-]*[a-z0-9+#]|[a-z0-9]")
+SUBTOKEN_PATTERN = re.compile(r"[_.+#-]+")
+
+
+class LexicalIndexUnavailable(RuntimeError):
+    pass
+
+
+def tokenize(text: str):
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        parts = [part for part in SUBTOKEN_PATTERN.split(token) if part]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def build_lexical_text(tool):
+    return f"{tool.name} {tool.name} {' '.join(tool.tags or [])} {tool.description}"
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._doc_lengths = {}
+        self._doc_terms = {}
+        self._doc_payloads = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._doc_lengths)
+
+    def upsert(self, doc_id: str, text: str, payload: dict = None):
+        term_counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            for term, count in term_counts.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            length = sum(term_counts.values())
+            self._doc_lengths[doc_id] = length
+            self._doc_terms[doc_id] = list(term_counts)
+            self._doc_payloads[doc_id] = payload or {}
+            self._total_length += length
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def doc_ids(self):
+        with self._lock:
+            return set(self._doc_lengths)
+
+    def payload(self, doc_id: str):
+        with self._lock:
+            return self._doc_payloads.get(doc_id, {})
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._doc_terms.clear()
+            self._doc_payloads.clear()
+            self._total_length = 0
+
+    def search(self, query: str, limit: int = 5, filters=None):
+        query_terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not doc_count or not query_terms:
+                return []
+
+            average_length = self._total_length / doc_count
+            scores = {}
+            for term in query_terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+            if filters is not None:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if matches_filters(self._doc_payloads[doc_id], filters)
+                }
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+    def _remove(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._doc_payloads.pop(doc_id, None)
+
+
+class LexicalIndexService:
+    def __init__(self):
+        self.enabled = settings.LEXICAL_INDEX_ENABLED
+        self.refresh_interval = settings.LEXICAL_INDEX_REFRESH_SECONDS
+        self.overlap = timedelta(seconds=settings.REINDEX_OVERLAP_SECONDS)
+        self.index = BM25Index(k1=settings.BM25_K1, b=settings.BM25_B)
+        self.ready = False
+        self._last_updated_at = None
+        self._refresh_task = None
+
+    def index_tool(self, tool):
+        if not self.enabled:
+            return
+        self.index.upsert(
+            str(tool.id),
+            build_lexical_text(tool),
+            {"name": tool.name, "tags": tool.tags, "metadata": tool.metadata_}
+        )
+
+    def remove_tool(self, tool_id: str):
+        if self.enabled:
+            self.index.remove(str(tool_id))
+
+    def search(self, query: str, limit: int = 5, filters=None):
+        return self.index.search(query, limit, filters)
+
+    def name(self, tool_id: str):
+        return self.index.payload(tool_id).get("name")
+
+    async def load(self, db: AsyncSession, since=None):
+        query = select(Tool).order_by(Tool.updated_at, Tool.id).execution_options(yield_per=settings.INGEST_CHUNK_SIZE)
+        if since is not None:
+            query = query.where(Tool.updated_at >= since - self.overlap)
+
+        result = await db.stream(query)
+        async for tool in result.scalars():
+            self.index_tool(tool)
+            if self._last_updated_at is None or tool.updated_at > self._last_updated_at:
+                self._last_updated_at = tool.updated_at
+
+    async def refresh(self, db: AsyncSession):
+        expected = await db.scalar(select(func.count()).select_from(Tool)) if self.ready else None
+        await self.load(db, since=self._last_updated_at)
+        if expected is not None and len(self.index) != expected:
+            await self.prune(db)
+
+    async def prune(self, db: AsyncSession):
+        indexed = self.index.doc_ids()
+        existing = {str(tool_id) for tool_id in (await db.execute(select(Tool.id))).scalars()}
+        for doc_id in indexed - existing:
+            self.index.remove(doc_id)
+
+    async def start(self):
+        if self.enabled and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.refresh(db)
+                self.ready = True
+            except Exception:
+                logger.exception("Failed to refresh the lexical index")
+            if self.ready and self.refresh_interval <= 0:
+                return
+            await asyncio.sleep(max(self.refresh_interval, 1))
+
+
+lexical_index = LexicalIndexService()
@@ -0,0 +1,443 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import numpy as np
+from qdrant_client.models import ScoredPoint
+from app.services.search_filters import matches_filters
+from app.services.tool_documents import build_point_id
+from app.services.vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+SCORE_BLOCK_SIZE = 65536
+DECODE_BLOCK_SIZE = 512
+IVF_MIN_POINTS_PER_LIST = 39
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def popcount(words):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    return POPCOUNT[words.view(np.uint8)]
+
+
+class ScalarQuantizer:
+    dtype = np.int8
+
+    def __init__(self, dimension: int, quantile: float = 0.99):
+        self.width = dimension
+        self.quantile = quantile
+        self.scale = None
+        self.fitted_on = 0
+
+    def fit(self, vectors):
+        if not len(vectors):
+            return
+        bounds = np.quantile(np.abs(vectors), self.quantile, axis=0)
+        if len(vectors) < 256:
+            bounds = np.full(self.width, bounds.max())
+        self.scale = np.where(bounds > 0, bounds, 1).astype(np.float32) / 127
+        self.fitted_on = len(vectors)
+
+    def needs_refit(self, count: int):
+        return self.fitted_on < SCORE_BLOCK_SIZE and count >= 2 * self.fitted_on
+
+    def encode(self, vectors):
+        if self.scale is None:
+            self.fit(vectors)
+        return np.clip(np.rint(vectors / self.scale), -127, 127).astype(np.int8)
+
+    def score(self, codes, query_vector):
+        query_vector = (query_vector * self.scale).astype(np.float32)
+        scores = np.empty(len(codes), dtype=np.float32)
+        decoded = np.empty((min(len(codes), DECODE_BLOCK_SIZE), self.width), dtype=np.float32)
+        for start in range(0, len(codes), DECODE_BLOCK_SIZE):
+            block = codes[start:start + DECODE_BLOCK_SIZE]
+            np.copyto(decoded[:len(block)], block)
+            np.matmul(decoded[:len(block)], query_vector, out=scores[start:start + len(block)])
+        return scores
+
+
+class BinaryQuantizer:
+    dtype = np.uint8
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.width = (dimension + 63) // 64 * 8
+
+    def fit(self, vectors):
+        pass
+
+    def needs_refit(self, count: int):
+        return False
+
+    def encode(self, vectors):
+        bits = np.packbits(vectors > 0, axis=-1)
+        padding = [(0, 0)] * (bits.ndim - 1) + [(0, self.width - bits.shape[-1])]
+        return np.pad(bits, padding)
+
+    def score(self, codes, query_vector):
+        differences = np.bitwise_xor(codes.view(np.uint64), self.encode(query_vector).view(np.uint64))
+        distances = popcount(differences).sum(axis=1, dtype=np.int32)
+        return 1 - 2 * distances.astype(np.float32) / self.dimension
+
+
+def build_quantizer(mode: str, dimension: int):
+    if mode == "int8":
+        return ScalarQuantizer(dimension)
+    if mode == "binary":
+        return BinaryQuantizer(dimension)
+    return None
+
+
+class IVFIndex:
+    def __init__(self, nlist: int, nprobe: int, iterations: int = 10):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.centroids = None
+        self.lists = []
+        self.assignments = {}
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def can_train(self, count: int):
+        return count >= self.nlist * IVF_MIN_POINTS_PER_LIST
+
+    def train(self, vectors):
+        count = len(vectors)
+        nlist = min(self.nlist, count)
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(count, size=min(count, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(self.iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            populated = np.bincount(labels, minlength=nlist) > 0
+            centroids[populated] = normalize(sums[populated])
+
+        self.centroids = centroids
+        self.lists = [set() for _ in range(nlist)]
+        self.assignments = {}
+        for start in range(0, count, 65536):
+            labels = np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+            for offset, cluster in enumerate(labels):
+                self.lists[cluster].add(start + offset)
+                self.assignments[start + offset] = cluster
+
+    def add(self, row: int, vector):
+        if not self.trained:
+            return
+        self.remove(row)
+        cluster = int(np.argmax(self.centroids @ vector))
+        self.lists[cluster].add(row)
+        self.assignments[row] = cluster
+
+    def remove(self, row: int):
+        cluster = self.assignments.pop(row, None)
+        if cluster is not None:
+            self.lists[cluster].discard(row)
+
+    def candidates(self, query_vector):
+        nprobe = min(self.nprobe, len(self.centroids))
+        probes = np.argpartition(-(self.centroids @ query_vector), nprobe - 1)[:nprobe]
+        rows = [row for cluster in probes for row in self.lists[cluster]]
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+
+
+class InMemoryVectorStore(VectorStore):
+    def __init__(self, dimension: int, index_type: str = "exact", nlist: int = 1024, nprobe: int = 32,
+                 snapshot_path: str = None, quantization: str = "none", rescore: bool = True,
+                 oversampling: float = 2.0):
+        self.dimension = dimension
+        self.snapshot_path = snapshot_path
+        self.ready = False
+        self.vectors = np.zeros((0, dimension), dtype=np.float32)
+        self.quantizer = build_quantizer(quantization, dimension)
+        self.codes = None
+        if self.quantizer is not None:
+            self.codes = np.zeros((0, self.quantizer.width), dtype=self.quantizer.dtype)
+        self.rescore = rescore
+        self.oversampling = oversampling
+        self.point_ids = []
+        self.payloads = []
+        self.rows = {}
+        self.ivf = IVFIndex(nlist, nprobe) if index_type == "ivf" else None
+        self._lock = threading.RLock()
+        self._generation = 0
+
+    def __len__(self):
+        return len(self.point_ids)
+
+    async def insert_vector(self, vector: list, payload: dict):
+        point_id = build_point_id(payload["id"])
+        await self.upsert_vectors([point_id], [vector], [payload])
+        return point_id
+
+    async def upsert_vectors(self, point_ids: list, vectors: list, payloads: list, collection_name: str = None):
+        self.upsert(point_ids, vectors, payloads)
+
+    async def update_vector(self, point_id: str, vector: list, payload: dict):
+        self.upsert([point_id], [vector], [payload])
+
+    async def set_payloads(self, point_ids: list, payloads: list):
+        with self._lock:
+            for point_id, payload in zip(point_ids, payloads):
+                row = self.rows.get(str(point_id))
+                if row is not None:
+                    self.payloads[row] = payload
+
+    async def delete_vector(self, point_id: str):
+        self.delete([point_id])
+
+    async def delete_vectors(self, point_ids: list):
+        self.delete(point_ids)
+
+    async def contains(self, point_ids: list):
+        with self._lock:
+            return {point_id for point_id in point_ids if point_id in self.rows}
+
+    async def get_payloads(self, point_ids: list):
+        with self._lock:
+            return {point_id: self.payloads[self.rows[point_id]] for point_id in point_ids if point_id in self.rows}
+
+    async def scroll_points(self, batch_size: int = 256):
+        with self._lock:
+            points = [(point_id, payload.get("id")) for point_id, payload in zip(self.point_ids, self.payloads)]
+        for start in range(0, len(points), batch_size):
+            yield points[start:start + batch_size]
+
+    async def search_similar(self, query_vector: list, limit: int = 5, filters=None):
+        return await asyncio.to_thread(self.search, query_vector, limit, filters)
+
+    async def start(self):
+        if self.snapshot_path and await asyncio.to_thread(self.load, self.snapshot_path):
+            logger.info("Loaded %d vectors from snapshot %s", len(self), self.snapshot_path)
+
+    async def search_batch(self, query_vectors: list, limits: list, filters_list: list):
+        return await asyncio.to_thread(
+            lambda: [
+                self.search(query_vector, limit, filters)
+                for query_vector, limit, filters in zip(query_vectors, limits, filters_list)
+            ]
+        )
+
+    async def close(self):
+        if self.snapshot_path:
+            await asyncio.to_thread(self.save, self.snapshot_path)
+
+    def upsert(self, point_ids: list, vectors: list, payloads: list):
+        vectors = normalize(vectors).reshape(-1, self.dimension)
+        with self._lock:
+            codes = self.quantizer.encode(vectors) if self.quantizer is not None else None
+            for position, (point_id, vector, payload) in enumerate(zip(point_ids, vectors, payloads)):
+                point_id = str(point_id)
+                row = self.rows.get(point_id)
+                if row is None:
+                    row = len(self.point_ids)
+                    self._reserve(row + 1)
+                    self.rows[point_id] = row
+                    self.point_ids.append(point_id)
+                    self.payloads.append(payload)
+                else:
+                    self.payloads[row] = payload
+                self.vectors[row] = vector
+                if codes is not None:
+                    self.codes[row] = codes[position]
+                if self.ivf is not None:
+                    self.ivf.add(row, vector)
+
+            if self.quantizer is not None and self.quantizer.needs_refit(len(self.point_ids)):
+                self._requantize()
+            if self.ivf is not None and not self.ivf.trained and self.ivf.can_train(len(self.point_ids)):
+                self.ivf.train(self.vectors[:len(self.point_ids)])
+
+    def delete(self, point_ids: list):
+        with self._lock:
+            for point_id in point_ids:
+                row = self.rows.pop(str(point_id), None)
+                if row is None:
+                    continue
+                self._generation += 1
+
+                last = len(self.point_ids) - 1
+                if self.ivf is not None:
+                    self.ivf.remove(row)
+                    self.ivf.remove(last)
+                if row != last:
+                    self.vectors[row] = self.vectors[last]
+                    if self.codes is not None:
+                        self.codes[row] = self.codes[last]
+                    self.point_ids[row] = self.point_ids[last]
+                    self.payloads[row] = self.payloads[last]
+                    self.rows[self.point_ids[row]] = row
+                    if self.ivf is not None:
+                        self.ivf.add(row, self.vectors[row])
+                self.point_ids.pop()
+                self.payloads.pop()
+
+    def search(self, query_vector: list, limit: int = 5, filters=None):
+        query_vector = normalize(query_vector)
+        with self._lock:
+            generation = self._generation
+            count, rows = self._candidates(query_vector)
+            vectors, codes = self.vectors, self.codes
+        if not count:
+            return []
+
+        scores = self._scores(vectors, codes, rows, count, query_vector)
+        with self._lock:
+            if generation != self._generation:
+                count, rows = self._candidates(query_vector)
+                if not count:
+                    return []
+                scores = self._scores(self.vectors, self.codes, rows, count, query_vector)
+            return self._select(scores, rows, limit, filters, query_vector)
+
+    def _candidates(self, query_vector):
+        count = len(self.point_ids)
+        if count and self.ivf is not None and self.ivf.trained:
+            return count, self.ivf.candidates(query_vector)
+        return count, None
+
+    def _scores(self, vectors, codes, rows, count: int, query_vector):
+        if self.quantizer is not None:
+            return self._quantized_scores(codes, rows, count, query_vector)
+        return (vectors[:count] if rows is None else vectors[rows]) @ query_vector
+
+    def _select(self, scores, rows, limit: int, filters, query_vector):
+        window = math.ceil(limit * self.oversampling) if self.quantizer is not None else limit
+        selected = []
+        for position in self._ranked_positions(scores, window, filters is not None):
+            row = int(position) if rows is None else int(rows[position])
+            if not matches_filters(self.payloads[row], filters):
+                continue
+            selected.append((row, float(scores[position])))
+            if len(selected) == window:
+                break
+
+        if self.quantizer is not None and self.rescore and selected:
+            selected_rows = [row for row, _ in selected]
+            exact_scores = (self.vectors[selected_rows] @ query_vector).tolist()
+            selected = sorted(zip(selected_rows, exact_scores), key=lambda item: item[1], reverse=True)
+
+        return [
+            ScoredPoint(id=self.point_ids[row], version=0, score=score, payload=self.payloads[row])
+            for row, score in selected[:limit]
+        ]
+
+    def memory_usage(self):
+        count = len(self.point_ids)
+        vectors_bytes = count * self.dimension * 4
+        usage = {"vectors_bytes": vectors_bytes, "vectors_on_disk": isinstance(self.vectors, np.memmap)}
+        usage["resident_bytes"] = 0 if usage["vectors_on_disk"] else vectors_bytes
+        if self.codes is not None:
+            usage["codes_bytes"] = count * self.quantizer.width * self.codes.itemsize
+            usage["resident_bytes"] += usage["codes_bytes"]
+        return usage
+
+    def save(self, path: str):
+        with self._lock:
+            count = len(self.point_ids)
+            vectors = np.lib.format.open_memmap(
+                f"{path}.vectors.npy.tmp", mode="w+", dtype=np.float32, shape=(count, self.dimension)
+            )
+            for start in range(0, count, SCORE_BLOCK_SIZE):
+                vectors[start:start + SCORE_BLOCK_SIZE] = self.vectors[start:min(start + SCORE_BLOCK_SIZE, count)]
+            vectors.flush()
+            del vectors
+            metadata = {"point_ids": list(self.point_ids), "payloads": list(self.payloads)}
+
+        with open(f"{path}.points.json.tmp", "w") as points_file:
+            json.dump(metadata, points_file)
+        os.replace(f"{path}.vectors.npy.tmp", f"{path}.vectors.npy")
+        os.replace(f"{path}.points.json.tmp", f"{path}.points.json")
+
+    def load(self, path: str):
+        if not os.path.exists(f"{path}.vectors.npy") or not os.path.exists(f"{path}.points.json"):
+            return False
+
+        vectors = np.load(f"{path}.vectors.npy", mmap_mode="c")
+        with open(f"{path}.points.json") as points_file:
+            metadata = json.load(points_file)
+        if vectors.shape[1] != self.dimension or len(vectors) != len(metadata["point_ids"]):
+            logger.warning("Ignoring vector snapshot %s: it does not match this store", path)
+            return False
+
+        with self._lock:
+            self.vectors = vectors
+            self.point_ids = metadata["point_ids"]
+            self.payloads = metadata["payloads"]
+            self.rows = {point_id: row for row, point_id in enumerate(self.point_ids)}
+            self._generation += 1
+            if self.quantizer is not None:
+                self.codes = np.zeros((len(vectors), self.quantizer.width), dtype=self.quantizer.dtype)
+                self._requantize()
+            if self.ivf is not None and self.ivf.can_train(len(self.point_ids)):
+                self.ivf.train(self.vectors)
+        return True
+
+    def _reserve(self, size: int):
+        if size <= len(self.vectors):
+            return
+        capacity = max(size, len(self.vectors) * 2, 1024)
+        vectors = self._allocate_vectors(capacity)
+        for start in range(0, len(self.point_ids), SCORE_BLOCK_SIZE):
+            end = min(start + SCORE_BLOCK_SIZE, len(self.point_ids))
+            vectors[start:end] = self.vectors[start:end]
+        self.vectors = vectors
+        if self.codes is not None:
+            codes = np.zeros((capacity, self.quantizer.width), dtype=self.quantizer.dtype)
+            codes[:len(self.point_ids)] = self.codes[:len(self.point_ids)]
+            self.codes = codes
+
+    def _allocate_vectors(self, capacity: int):
+        if self.quantizer is None:
+            return np.zeros((capacity, self.dimension), dtype=np.float32)
+        directory = os.path.dirname(os.path.abspath(self.snapshot_path)) if self.snapshot_path else None
+        with tempfile.TemporaryFile(dir=directory) as spill_file:
+            return np.memmap(spill_file, dtype=np.float32, mode="w+", shape=(capacity, self.dimension))
+
+    def _requantize(self):
+        self._generation += 1
+        count = len(self.point_ids)
+        self.quantizer.fit(self.vectors[:min(count, SCORE_BLOCK_SIZE)])
+        for start in range(0, count, SCORE_BLOCK_SIZE):
+            end = min(start + SCORE_BLOCK_SIZE, count)
+            self.codes[start:end] = self.quantizer.encode(self.vectors[start:end])
+
+    def _quantized_scores(self, codes, rows, count: int, query_vector):
+        codes = codes[:count] if rows is None else codes[rows]
+        if not len(codes):
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate([
+            self.quantizer.score(codes[start:start + SCORE_BLOCK_SIZE], query_vector)
+            for start in range(0, len(codes), SCORE_BLOCK_SIZE)
+        ])
+
+    def _ranked_positions(self, scores, limit: int, filtered: bool):
+        window = limit * 10 if filtered else limit
+        if window >= len(scores):
+            yield from np.argsort(-scores)
+            return
+
+        top = np.argpartition(-scores, window - 1)[:window]
+        top = top[np.argsort(-scores[top])]
+        yield from top
+        if filtered:
+            seen = set(top.tolist())
+            yield from (position for position in np.argsort(-scores) if position not in seen)
@@ -0,0 +1,175 @@
+import bisect
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+request_timings = ContextVar("request_timings", default=None)
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+class Metric(ABC):
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self):
+        raise NotImplementedError
+
+    def _key(self, labels: dict):
+        return tuple(labels[name] for name in self.labelnames)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: tuple, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def totals(self):
+        with self._lock:
+            return {key: (sum(counts), total) for key, (counts, total) in self._series.items()}
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(counts), total) for key, (counts, total) in self._series.items()]
+
+        samples = []
+        for key, counts, total in snapshot:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class CallbackMetric(Metric):
+    def __init__(self, name: str, documentation: str, callback, metric_type: str = "gauge", labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+        self.type = metric_type
+
+    def samples(self):
+        value = self.callback()
+        if not self.labelnames:
+            return [(self.name, {}, value)]
+        return [(self.name, {self.labelnames[0]: label}, item) for label, item in value.items()]
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics = {}
+
+    def register(self, metric: Metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: tuple = LATENCY_BUCKETS, labelnames: tuple = ()):
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def callback(self, name: str, documentation: str, callback, metric_type: str = "gauge", labelnames: tuple = ()):
+        return self.register(CallbackMetric(name, documentation, callback, metric_type, labelnames))
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = metric.samples()
+            except Exception:
+                logger.exception("Failed to collect metric %s", metric.name)
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in samples:
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+stage_seconds = metrics.histogram(
+    "tool_search_stage_seconds", "Time spent in each search pipeline stage", labelnames=("stage",)
+)
+search_seconds = metrics.histogram(
+    "tool_search_search_seconds", "End-to-end search latency", labelnames=("mode",)
+)
+batch_size = metrics.histogram(
+    "tool_search_batch_size", "Items processed per batch", SIZE_BUCKETS, labelnames=("kind",)
+)
+
+
+def observe_batch(kind: str, size: int):
+    if metrics.enabled:
+        batch_size.observe(size, kind=kind)
+
+
+def observe_search(mode: str, seconds: float):
+    if metrics.enabled:
+        search_seconds.observe(seconds, mode=mode)
+
+
+class StageTimer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        if metrics.enabled:
+            stage_seconds.observe(elapsed, stage=self.stage)
+        timings = request_timings.get()
+        if timings is not None:
+            timings[self.stage] = timings.get(self.stage, 0.0) + elapsed
+
+
+def timed(stage: str):
+    return StageTimer(stage)
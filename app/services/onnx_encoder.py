@@ -0,0 +1,79 @@
+import json
+import os
+import numpy as np
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+CONFIG_FILE = "embedding_config.json"
+
+
+class OnnxEncoder:
+    def __init__(self, model_dir: str, quantized: bool = False, intra_op_threads: int = 0,
+                 truncate_dim: int = None, batch_size: int = 32):
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, CONFIG_FILE)) as config_file:
+            config = json.load(config_file)
+        self.pooling = config.get("pooling", "mean")
+        self.normalize = config.get("normalize", False)
+        self.truncate_dim = truncate_dim
+        self.batch_size = batch_size
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=config["max_seq_length"])
+        self.tokenizer.enable_padding(pad_id=config.get("pad_token_id", 0))
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self):
+        dimension = self.session.get_outputs()[0].shape[-1]
+        return self.truncate_dim or dimension
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        embeddings = [None] * len(texts)
+        for start in range(0, len(texts), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for index, embedding in zip(batch, self._encode_batch([texts[index] for index in batch])):
+                embeddings[index] = embedding
+
+        if not embeddings:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = np.stack(embeddings)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: list):
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        if self.pooling == "cls":
+            embeddings = token_embeddings[:, 0]
+        else:
+            mask = attention_mask[..., None].astype(np.float32)
+            embeddings = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.normalize:
+            embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        if self.truncate_dim:
+            embeddings = embeddings[:, :self.truncate_dim]
+        return embeddings.astype(np.float32)
@@ -0,0 +1,22 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, tool_id):
+    position = json.dumps([created_at.isoformat(), str(tool_id)])
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, tool_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), UUID(tool_id)
+    except (ValueError, TypeError) as error:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from error
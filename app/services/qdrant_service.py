@@ -1,37 +1,167 @@
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
-from app.database.qdrant import get_qdrant_client
+import asyncio
+from qdrant_client.models import (
+    PointStruct,
+    Filter,
+    FieldCondition,
+    MatchValue,
+    MatchAny,
+    OverwritePayloadOperation,
+    Range,
+    QuantizationSearchParams,
+    QueryRequest,
+    SearchParams,
+    SetPayload
+)
+from app.database.qdrant import get_async_qdrant_client, initialize_collection
+from app.services.vector_store import VectorStore
+from app.services.tool_documents import build_point_id
 from app.config.settings import settings
-from uuid import uuid4
 
 
-class QdrantService:
+class QdrantService(VectorStore):
     def __init__(self):
-        self.client = get_qdrant_client()
+        self._client = None
         self.collection_name = settings.QDRANT_COLLECTION_NAME
+        self.search_params = None
+        if settings.VECTOR_QUANTIZATION != "none":
+            self.search_params = SearchParams(
+                quantization=QuantizationSearchParams(
+                    rescore=settings.SEARCH_RESCORE,
+                    oversampling=settings.SEARCH_OVERSAMPLING
+                )
+            )
 
-    def insert_vector(self, vector: list, payload: dict):
-        point_id = str(uuid4())
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_async_qdrant_client()
+        return self._client
+
+    async def start(self):
+        await initialize_collection()
+        await asyncio.gather(*(self.client.get_collections() for _ in range(max(settings.QDRANT_POOL_SIZE, 1))))
+
+    async def insert_vector(self, vector: list, payload: dict):
+        point_id = build_point_id(payload["id"])
         point = PointStruct(id=point_id, vector=vector, payload=payload)
-        self.client.upsert(collection_name=self.collection_name, points=[point])
+        await self.client.upsert(collection_name=self.collection_name, points=[point])
         return point_id
 
-    def search_similar(self, query_vector: list, limit: int = 5):
-        search_result = self.client.search(
+    async def upsert_vectors(self, point_ids: list, vectors: list, payloads: list, collection_name: str = None):
+        points = [
+            PointStruct(id=point_id, vector=vector, payload=payload)
+            for point_id, vector, payload in zip(point_ids, vectors, payloads)
+        ]
+        await self.client.upsert(
+            collection_name=collection_name or self.collection_name,
+            points=points,
+            wait=True
+        )
+
+    def build_filter(self, filters):
+        if filters is None:
+            return None
+
+        conditions = []
+        if filters.tags_any:
+            conditions.append(FieldCondition(key="tags", match=MatchAny(any=filters.tags_any)))
+        for tag in filters.tags_all:
+            conditions.append(FieldCondition(key="tags", match=MatchValue(value=tag)))
+        for key, value in filters.metadata.items():
+            conditions.append(FieldCondition(key=f"metadata.{key}", match=MatchValue(value=value)))
+        for key, bounds in filters.metadata_ranges.items():
+            conditions.append(FieldCondition(key=f"metadata.{key}", range=Range(**bounds.model_dump())))
+
+        return Filter(must=conditions) if conditions else None
+
+    async def search_similar(self, query_vector: list, limit: int = 5, filters=None):
+        response = await self.client.query_points(
             collection_name=self.collection_name,
-            query_vector=query_vector,
+            query=query_vector,
+            query_filter=self.build_filter(filters),
+            search_params=self.search_params,
             limit=limit
         )
-        return search_result
+        return response.points
+
+    async def search_batch(self, query_vectors: list, limits: list, filters_list: list):
+        responses = await self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                QueryRequest(
+                    query=query_vector,
+                    filter=self.build_filter(filters),
+                    params=self.search_params,
+                    limit=limit,
+                    with_payload=True
+                )
+                for query_vector, limit, filters in zip(query_vectors, limits, filters_list)
+            ]
+        )
+        return [response.points for response in responses]
 
-    def update_vector(self, point_id: str, vector: list, payload: dict):
+    async def update_vector(self, point_id: str, vector: list, payload: dict):
         point = PointStruct(id=point_id, vector=vector, payload=payload)
-        self.client.upsert(collection_name=self.collection_name, points=[point])
+        await self.client.upsert(collection_name=self.collection_name, points=[point])
+
+    async def set_payloads(self, point_ids: list, payloads: list):
+        await self.client.batch_update_points(
+            collection_name=self.collection_name,
+            update_operations=[
+                OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[point_id]))
+                for point_id, payload in zip(point_ids, payloads)
+            ]
+        )
 
-    def delete_vector(self, point_id: str):
-        self.client.delete(
+    async def delete_vector(self, point_id: str):
+        await self.client.delete(
             collection_name=self.collection_name,
             points_selector=[point_id]
         )
 
+    async def delete_vectors(self, point_ids: list):
+        await self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=list(point_ids)
+        )
+
+    async def contains(self, point_ids: list):
+        points = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=point_ids,
+            with_payload=False,
+            with_vectors=False
+        )
+        return {str(point.id) for point in points}
+
+    async def get_payloads(self, point_ids: list):
+        points = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=point_ids,
+            with_payload=True,
+            with_vectors=False
+        )
+        return {str(point.id): point.payload for point in points}
+
+    async def scroll_points(self, batch_size: int = 256):
+        offset = None
+        while True:
+            points, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["id"],
+                with_vectors=False
+            )
+            if points:
+                yield [(str(point.id), (point.payload or {}).get("id")) for point in points]
+            if offset is None:
+                break
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
 
 qdrant_service = QdrantService()
\ No newline at end of file
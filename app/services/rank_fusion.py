@@ -0,0 +1,6 @@
+def reciprocal_rank_fusion(ranked_lists: list, k: int = 60):
+    scores = {}
+    for ranked_ids in ranked_lists:
+        for rank, doc_id in enumerate(ranked_ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
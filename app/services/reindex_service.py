@@ -0,0 +1,94 @@
+from datetime import timedelta
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.tool import Tool
+from app.models.reindex_checkpoint import ReindexCheckpoint
+from app.services.embedding_service import embedding_service
+from app.services.ingestion_service import ingestion_pipeline, IngestionStats
+from app.services.search_cache import search_cache
+from app.services.tool_documents import build_content_hash
+from app.config.settings import settings
+
+
+class ReindexStats(IngestionStats):
+    def __init__(self):
+        super().__init__()
+        self.scanned = 0
+
+    def __str__(self):
+        return (
+            f"scanned {self.scanned}, re-embedded {self.processed} tools "
+            f"in {self.elapsed_seconds:.1f}s ({self.tools_per_second:.1f} tools/s)"
+        )
+
+
+class ReindexJob:
+    def __init__(self, job_name: str = "tools"):
+        self.job_name = job_name
+        self.chunk_size = settings.INGEST_CHUNK_SIZE
+        self.overlap = timedelta(seconds=settings.REINDEX_OVERLAP_SECONDS)
+
+    def needs_reindex(self, tool: Tool):
+        return (
+            not tool.vector_id
+            or tool.embedding_model != embedding_service.fingerprint
+            or tool.content_hash != build_content_hash(tool)
+        )
+
+    async def run(self, db: AsyncSession, full: bool = False, progress=None):
+        fingerprint = embedding_service.fingerprint
+        stats = ReindexStats()
+
+        checkpoint = await db.get(ReindexCheckpoint, self.job_name)
+        if checkpoint is None:
+            checkpoint = ReindexCheckpoint(job_name=self.job_name, model_fingerprint=fingerprint)
+            db.add(checkpoint)
+        if full or checkpoint.model_fingerprint != fingerprint:
+            checkpoint.model_fingerprint = fingerprint
+            checkpoint.last_updated_at = None
+            checkpoint.last_id = None
+        checkpoint.completed_at = None
+        upper_bound = await db.scalar(select(func.now()))
+        await db.commit()
+
+        position = None
+        if checkpoint.last_updated_at is not None:
+            position = (checkpoint.last_updated_at - self.overlap, checkpoint.last_id)
+
+        while True:
+            query = (
+                select(Tool)
+                .where(Tool.updated_at <= upper_bound)
+                .order_by(Tool.updated_at, Tool.id)
+                .limit(self.chunk_size)
+            )
+            if position is not None:
+                query = query.where(tuple_(Tool.updated_at, Tool.id) > tuple_(*position))
+            tools = (await db.execute(query)).scalars().all()
+            if not tools:
+                break
+
+            position = (tools[-1].updated_at, tools[-1].id)
+            stale_tools = [tool for tool in tools if self.needs_reindex(tool)]
+            stats.scanned += len(tools)
+
+            if stale_tools:
+                await ingestion_pipeline.index_tools(db, stale_tools, commit=False)
+
+            checkpoint.last_updated_at, checkpoint.last_id = position
+            await db.commit()
+
+            stats.processed += len(stale_tools)
+            stats.chunks += 1
+            if progress:
+                progress(stats)
+
+        checkpoint.completed_at = func.now()
+        await db.commit()
+
+        if stats.processed:
+            search_cache.invalidate()
+        return stats
+
+
+reindex_job = ReindexJob()
@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_rerank_text(result: dict):
+    return f"{result['name']}. {result['description']} {' '.join(result.get('tags') or [])}"
+
+
+class RerankService:
+    def __init__(self):
+        self.enabled = settings.RERANK_ENABLED
+        self.model_name = settings.RERANK_MODEL
+        self.candidates = settings.RERANK_CANDIDATES
+        self.timeout = settings.RERANK_TIMEOUT_MS / 1000
+        self.cache_size = settings.RERANK_CACHE_SIZE
+        self.max_pending = settings.RERANK_MAX_PENDING
+        self.timeouts = 0
+        self.skipped = 0
+        self.ready = False
+        self._pending = 0
+        self._model = None
+        self._executor = None
+        self._loading = None
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        return self._executor
+
+    def start(self):
+        if self.enabled:
+            self.warm_up()
+
+    def warm_up(self):
+        with self._model_lock:
+            if self._loading is not None:
+                return
+            self._loading = self.executor.submit(self._load)
+        self._loading.add_done_callback(self._log_load_failure)
+
+    def _load(self):
+        self.model.predict([("warm up", "warm up")])
+        self.ready = True
+
+    def _log_load_failure(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._loading = None
+            logger.error("Failed to load re-ranking model %s", self.model_name, exc_info=future.exception())
+
+    def make_key(self, query: str, result: dict):
+        text_hash = hashlib.sha256(build_rerank_text(result).encode("utf-8")).hexdigest()
+        return " ".join(query.split()), str(result["id"]), text_hash
+
+    async def rerank(self, query: str, results: list, limit: int):
+        keys = [self.make_key(query, result) for result in results]
+        scores = self._cached_scores(keys)
+        missing = [index for index, score in enumerate(scores) if score is None]
+
+        if missing:
+            if not self.ready:
+                self.warm_up()
+                self.skipped += 1
+                return results[:limit], False
+            if not self._reserve_slot():
+                self.skipped += 1
+                return results[:limit], False
+
+            future = self.executor.submit(
+                self._score,
+                query,
+                [results[index] for index in missing],
+                [keys[index] for index in missing]
+            )
+            future.add_done_callback(self._release_slot)
+            try:
+                fresh_scores = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                future.cancel()
+                self.timeouts += 1
+                logger.warning("Re-ranking exceeded %.0f ms; returning first-stage order", self.timeout * 1000)
+                return results[:limit], False
+            for index, score in zip(missing, fresh_scores):
+                scores[index] = score
+
+        ranked = sorted(zip(results, scores), key=lambda item: item[1], reverse=True)
+        return [{**result, "score": score} for result, score in ranked[:limit]], True
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def _release_slot(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _score(self, query: str, results: list, keys: list):
+        pairs = [(query, build_rerank_text(result)) for result in results]
+        scores = [float(score) for score in self.model.predict(pairs)]
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+        return scores
+
+    def _cached_scores(self, keys: list):
+        scores = []
+        with self._lock:
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                scores.append(score)
+        return scores
+
+
+rerank_service = RerankService()
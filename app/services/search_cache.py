@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from app.config.settings import settings
+
+
+class SearchCacheBackend(ABC):
+    @abstractmethod
+    def get(self, key):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key, value):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_version(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_version(self) -> int:
+        raise NotImplementedError
+
+
+class InMemorySearchCacheBackend(SearchCacheBackend):
+    def __init__(self, max_size: int, ttl_seconds: int = 0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_version(self) -> int:
+        return self._version
+
+    def bump_version(self) -> int:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            return self._version
+
+
+class SearchCache:
+    def __init__(self, backend: SearchCacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, query: str, limit: int, **options):
+        return (
+            self.backend.get_version(),
+            " ".join(query.split()),
+            limit,
+            json.dumps(options, sort_keys=True, default=str)
+        )
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.enabled:
+            self.backend.set(key, value)
+
+    def invalidate(self):
+        self.backend.bump_version()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "version": self.backend.get_version(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+search_cache = SearchCache(
+    InMemorySearchCacheBackend(
+        max_size=settings.SEARCH_CACHE_SIZE,
+        ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS
+    ),
+    enabled=settings.SEARCH_CACHE_SIZE > 0
+)
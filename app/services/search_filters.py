@@ -0,0 +1,27 @@
+def matches_filters(payload: dict, filters):
+    if filters is None:
+        return True
+
+    tags = set(payload.get("tags") or [])
+    if filters.tags_any and not tags.intersection(filters.tags_any):
+        return False
+    if filters.tags_all and not tags.issuperset(filters.tags_all):
+        return False
+
+    metadata = payload.get("metadata") or {}
+    for key, value in filters.metadata.items():
+        if metadata.get(key) != value:
+            return False
+    for key, bounds in filters.metadata_ranges.items():
+        value = metadata.get(key)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+        if bounds.gt is not None and not value > bounds.gt:
+            return False
+        if bounds.gte is not None and not value >= bounds.gte:
+            return False
+        if bounds.lt is not None and not value < bounds.lt:
+            return False
+        if bounds.lte is not None and not value <= bounds.lte:
+            return False
+    return True
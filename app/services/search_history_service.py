@@ -0,0 +1,124 @@
+import logging
+import queue
+import random
+import threading
+import time
+from sqlalchemy import insert
+from app.database.postgres import SessionLocal
+from app.models.search_history import SearchHistory
+from app.services.metrics import timed, observe_batch
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHistoryWriter:
+    def __init__(self):
+        self.queue = queue.Queue(maxsize=settings.SEARCH_HISTORY_QUEUE_SIZE)
+        self.batch_size = settings.SEARCH_HISTORY_BATCH_SIZE
+        self.flush_interval = settings.SEARCH_HISTORY_FLUSH_INTERVAL_MS / 1000
+        self.backpressure_threshold = int(
+            settings.SEARCH_HISTORY_QUEUE_SIZE * settings.SEARCH_HISTORY_BACKPRESSURE_RATIO
+        )
+        self.sample_rate = settings.SEARCH_HISTORY_BACKPRESSURE_SAMPLE_RATE
+        self.store_payloads = settings.SEARCH_HISTORY_STORE_PAYLOADS
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._dropped_lock = threading.Lock()
+        self._stopped = False
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def record(self, query: str, results: list, response_time: int):
+        if not self._ensure_started():
+            self._drop()
+            return
+
+        if self.queue.qsize() >= self.backpressure_threshold and random.random() >= self.sample_rate:
+            self._drop()
+            return
+
+        if not self.store_payloads:
+            results = [{"id": result["id"], "score": result["score"]} for result in results]
+
+        try:
+            self.queue.put_nowait({
+                "query": query,
+                "results": results,
+                "result_count": len(results),
+                "response_time_ms": response_time
+            })
+        except queue.Full:
+            self._drop()
+
+    def start(self):
+        with self._lock:
+            self._stopped = False
+            self._spawn()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+            self._thread = None
+        if thread:
+            self._stop_event.set()
+            thread.join()
+
+    def _ensure_started(self):
+        if self._thread:
+            return True
+        with self._lock:
+            if self._stopped:
+                return False
+            self._spawn()
+            return True
+
+    def _spawn(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="search-history-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _drop(self, count: int = 1):
+        with self._dropped_lock:
+            self.dropped += count
+
+    def _run(self):
+        while not self._stop_event.is_set() or not self.queue.empty():
+            batch = self._collect_batch()
+            if batch:
+                observe_batch("search_history", len(batch))
+                with timed("history_flush"):
+                    self._flush(batch)
+
+    def _collect_batch(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self, batch: list):
+        db = SessionLocal()
+        try:
+            db.execute(insert(SearchHistory), batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            self._drop(len(batch))
+            logger.exception("Failed to write %d search history records", len(batch))
+        finally:
+            db.close()
+
+
+search_history_writer = SearchHistoryWriter()
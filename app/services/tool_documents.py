@@ -0,0 +1,24 @@
+import hashlib
+from uuid import NAMESPACE_URL, uuid5
+
+
+def build_tool_text(tool):
+    return f"{tool.name} {tool.description} {' '.join(tool.tags)}"
+
+
+def build_tool_payload(tool):
+    return {
+        "id": str(tool.id),
+        "name": tool.name,
+        "description": tool.description,
+        "tags": tool.tags,
+        "metadata": tool.metadata_
+    }
+
+
+def build_point_id(tool_id):
+    return str(uuid5(NAMESPACE_URL, f"tools/{tool_id}"))
+
+
+def build_content_hash(tool):
+    return hashlib.sha256(build_tool_text(tool).encode("utf-8")).hexdigest()
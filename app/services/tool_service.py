@@ -1,49 +1,107 @@
-from sqlalchemy.orm import Session
+import asyncio
+import logging
+from uuid import UUID, uuid4
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.postgres import AsyncSessionLocal
 from app.models.tool import Tool
-from app.models.search_history import SearchHistory
 from app.schemas.tool import ToolCreate, ToolUpdate
 from app.services.embedding_service import embedding_service
-from app.services.qdrant_service import qdrant_service
+from app.services.vector_backend import vector_store
+from app.services.search_history_service import search_history_writer
+from app.services.search_cache import search_cache
+from app.services.tool_documents import build_content_hash, build_point_id
+from app.services.ingestion_service import ingestion_pipeline
+from app.services.vector_outbox import enqueue_vector_write, vector_outbox_worker
+from app.services.lexical_index import lexical_index, LexicalIndexUnavailable
+from app.services.rank_fusion import reciprocal_rank_fusion
+from app.services.rerank_service import rerank_service
+from app.services.pagination import encode_cursor
+from app.services.metrics import timed, observe_batch, observe_search
+from qdrant_client.models import ScoredPoint
+from app.config.settings import settings
 import time
 
+logger = logging.getLogger(__name__)
+
+SEARCH_RESULT_FIELDS = {"id", "name", "description", "tags", "metadata"}
+TOOL_FIELDS = {
+    "id": Tool.id,
+    "name": Tool.name,
+    "description": Tool.description,
+    "tags": Tool.tags,
+    "metadata": Tool.metadata_,
+    "vector_id": Tool.vector_id,
+    "created_at": Tool.created_at,
+    "updated_at": Tool.updated_at
+}
+
 
 class ToolService:
-    def create_tool(self, db: Session, tool_data: ToolCreate):
-        combined_text = f"{tool_data.name} {tool_data.description} {' '.join(tool_data.tags)}"
-        embedding = embedding_service.generate_embedding(combined_text)
-        
+    async def create_tool(self, db: AsyncSession, tool_data: ToolCreate):
+        tool_id = uuid4()
         tool = Tool(
+            id=tool_id,
             name=tool_data.name,
             description=tool_data.description,
             tags=tool_data.tags,
-            metadata_=tool_data.metadata
+            metadata_=tool_data.metadata,
+            vector_id=build_point_id(tool_id),
+            content_hash=build_content_hash(tool_data),
+            embedding_model=embedding_service.fingerprint
         )
         db.add(tool)
-        db.commit()
-        db.refresh(tool)
-        
-        payload = {
-            "id": str(tool.id),
-            "name": tool.name,
-            "description": tool.description,
-            "tags": tool.tags
-        }
-        vector_id = qdrant_service.insert_vector(embedding, payload)
-        
-        tool.vector_id = vector_id
-        db.commit()
-        db.refresh(tool)
+        enqueue_vector_write(db, tool_id, "upsert", tool.vector_id)
+        await db.commit()
+        await db.refresh(tool)
         
+        lexical_index.index_tool(tool)
+        search_cache.invalidate()
+        vector_outbox_worker.notify()
         return tool
 
-    def get_tool(self, db: Session, tool_id: str):
-        return db.query(Tool).filter(Tool.id == tool_id).first()
+    async def create_tools_bulk(self, db: AsyncSession, tools_data: list):
+        created_tools, stats = await ingestion_pipeline.ingest_tools(db, tools_data)
+        for tool in created_tools:
+            lexical_index.index_tool(tool)
+        search_cache.invalidate()
+        vector_outbox_worker.notify()
+        return created_tools, stats
 
-    def get_all_tools(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Tool).offset(skip).limit(limit).all()
+    async def get_tool(self, db: AsyncSession, tool_id: str):
+        try:
+            tool_id = UUID(str(tool_id))
+        except ValueError:
+            return None
+        result = await db.execute(select(Tool).where(Tool.id == tool_id))
+        return result.scalars().first()
 
-    def update_tool(self, db: Session, tool_id: str, tool_data: ToolUpdate):
-        tool = db.query(Tool).filter(Tool.id == tool_id).first()
+    async def get_tools_page(self, db: AsyncSession, limit: int = 100, cursor=None, fields=None, skip: int = 0):
+        fields = fields or list(TOOL_FIELDS)
+        query = self.tools_query(fields).limit(limit)
+        if cursor is not None:
+            query = query.where(tuple_(Tool.created_at, Tool.id) > tuple_(*cursor))
+        elif skip:
+            query = query.offset(skip)
+        
+        rows = (await db.execute(query)).mappings().all()
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if rows and len(rows) == limit else None
+        return [{field: row[field] for field in fields} for row in rows], next_cursor
+
+    async def export_tools(self, fields=None):
+        fields = fields or list(TOOL_FIELDS)
+        query = self.tools_query(fields).execution_options(yield_per=settings.TOOLS_EXPORT_CHUNK_SIZE)
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query)
+            async for rows in result.mappings().partitions():
+                yield [{field: row[field] for field in fields} for row in rows]
+
+    def tools_query(self, fields: list):
+        columns = [TOOL_FIELDS[field].label(field) for field in dict.fromkeys([*fields, "created_at", "id"])]
+        return select(*columns).order_by(Tool.created_at, Tool.id)
+
+    async def update_tool(self, db: AsyncSession, tool_id: str, tool_data: ToolUpdate):
+        tool = await self.get_tool(db, tool_id)
         if not tool:
             return None
         
@@ -54,65 +112,310 @@ class ToolService:
             else:
                 setattr(tool, field, value)
         
-        combined_text = f"{tool.name} {tool.description} {' '.join(tool.tags)}"
-        embedding = embedding_service.generate_embedding(combined_text)
+        content_hash = build_content_hash(tool)
+        text_changed = (
+            not tool.vector_id
+            or tool.content_hash != content_hash
+            or tool.embedding_model != embedding_service.fingerprint
+        )
+        tool.content_hash = content_hash
+        tool.embedding_model = embedding_service.fingerprint
+        tool.vector_id = tool.vector_id or build_point_id(tool.id)
+        enqueue_vector_write(db, tool.id, "upsert" if text_changed else "payload", tool.vector_id)
         
-        payload = {
-            "id": str(tool.id),
-            "name": tool.name,
-            "description": tool.description,
-            "tags": tool.tags
-        }
-        qdrant_service.update_vector(tool.vector_id, embedding, payload)
+        await db.commit()
+        await db.refresh(tool)
         
-        db.commit()
-        db.refresh(tool)
+        lexical_index.index_tool(tool)
+        search_cache.invalidate()
+        vector_outbox_worker.notify()
         return tool
 
-    def delete_tool(self, db: Session, tool_id: str):
-        tool = db.query(Tool).filter(Tool.id == tool_id).first()
+    async def delete_tool(self, db: AsyncSession, tool_id: str):
+        tool = await self.get_tool(db, tool_id)
         if not tool:
             return False
         
         if tool.vector_id:
-            qdrant_service.delete_vector(tool.vector_id)
+            enqueue_vector_write(db, tool.id, "delete", tool.vector_id)
+        
+        await db.delete(tool)
+        await db.commit()
         
-        db.delete(tool)
-        db.commit()
+        lexical_index.remove_tool(tool.id)
+        search_cache.invalidate()
+        vector_outbox_worker.notify()
         return True
 
-    def search_tools(self, db: Session, query: str, limit: int = 5):
-        start_time = time.time()
+    async def search_tools(
+        self, db: AsyncSession, query: str, limit: int = 5, filters=None, mode: str = "vector", rerank: bool = None
+    ):
+        start_time = time.perf_counter()
+        if rerank is None:
+            rerank = rerank_service.enabled
+        
+        cache_key = self.search_cache_key(query, limit, filters, mode, rerank)
+        results = search_cache.get(cache_key)
+        reranked = rerank
+        if results is None:
+            candidates = max(limit, rerank_service.candidates) if rerank else limit
+            search_results = await self.retrieve(query, candidates, filters, mode)
+            
+            results = await self.hydrate_results(db, search_results)
+            results, reranked = await self.finish_search(query, limit, rerank, cache_key, results)
+        
+        elapsed = time.perf_counter() - start_time
+        response_time = int(elapsed * 1000)
+        observe_search(mode, elapsed)
+        
+        search_history_writer.record(query, results, response_time)
+        
+        return results, response_time, reranked
+
+    async def search_tools_stream(
+        self, query: str, limit: int = 5, filters=None, mode: str = "vector", rerank: bool = None
+    ):
+        start_time = time.perf_counter()
+        if rerank is None:
+            rerank = rerank_service.enabled
+        
+        timings = {}
+        cache_key = self.search_cache_key(query, limit, filters, mode, rerank)
+        results = search_cache.get(cache_key)
+        cached = results is not None
+        reranked = rerank
+        if not cached:
+            candidates = max(limit, rerank_service.candidates) if rerank else limit
+            stage_start = time.perf_counter()
+            search_results = await self.retrieve(query, candidates, filters, mode)
+            timings["retrieval_ms"] = int((time.perf_counter() - stage_start) * 1000)
+            yield {"event": "skeleton", "results": [self.skeleton_result(result) for result in search_results[:limit]]}
+            
+            stage_start = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                results = await self.hydrate_results(db, search_results)
+            timings["hydration_ms"] = int((time.perf_counter() - stage_start) * 1000)
+            
+            stage_start = time.perf_counter()
+            results, reranked = await self.finish_search(query, limit, rerank, cache_key, results)
+            if rerank:
+                timings["rerank_ms"] = int((time.perf_counter() - stage_start) * 1000)
+        
+        yield {"event": "results", "results": results, "result_count": len(results)}
+        
+        elapsed = time.perf_counter() - start_time
+        response_time = int(elapsed * 1000)
+        observe_search(mode, elapsed)
+        search_history_writer.record(query, results, response_time)
+        yield {
+            "event": "timing", "cached": cached, "reranked": reranked, **timings, "response_time_ms": response_time
+        }
+
+    def skeleton_result(self, result):
+        skeleton = {"id": result.payload["id"], "name": result.payload.get("name"), "score": result.score}
+        return {key: value for key, value in skeleton.items() if value is not None}
+
+    async def search_tools_batch(self, db: AsyncSession, searches: list):
+        start_time = time.perf_counter()
+        observe_batch("search", len(searches))
+        
+        reranks = [rerank_service.enabled if search.rerank is None else search.rerank for search in searches]
+        cache_keys = [
+            self.search_cache_key(search.query, search.limit, search.filters, search.mode, rerank)
+            for search, rerank in zip(searches, reranks)
+        ]
+        results = [search_cache.get(cache_key) for cache_key in cache_keys]
+        reranked = list(reranks)
+        response_times = [int((time.perf_counter() - start_time) * 1000) if result is not None else None for result in results]
+        
+        pending = [index for index, result in enumerate(results) if result is None]
+        if pending:
+            search_results = await self.retrieve_batch([
+                (
+                    searches[index].query,
+                    max(searches[index].limit, rerank_service.candidates) if reranks[index] else searches[index].limit,
+                    searches[index].filters,
+                    searches[index].mode
+                )
+                for index in pending
+            ])
+            hydrated = await self.hydrate_batch(db, search_results)
+            
+            async def finish(index: int, hydrated_results: list):
+                search = searches[index]
+                results[index], reranked[index] = await self.finish_search(
+                    search.query, search.limit, reranks[index], cache_keys[index], hydrated_results
+                )
+                response_times[index] = int((time.perf_counter() - start_time) * 1000)
+            
+            await asyncio.gather(*(finish(index, hydrated_results) for index, hydrated_results in zip(pending, hydrated)))
+        
+        for search, search_result, response_time in zip(searches, results, response_times):
+            search_history_writer.record(search.query, search_result, response_time)
+        
+        total_response_time = int((time.perf_counter() - start_time) * 1000)
+        return list(zip(results, response_times, reranked)), total_response_time
+
+    def search_cache_key(self, query: str, limit: int, filters, mode: str, rerank: bool):
+        return search_cache.make_key(
+            query, limit, filters=filters.model_dump() if filters else None, mode=mode, rerank=rerank
+        )
+
+    async def finish_search(self, query: str, limit: int, rerank: bool, cache_key, results: list):
+        reranked = False
+        if rerank and results:
+            with timed("rerank"):
+                results, reranked = await rerank_service.rerank(query, results, limit)
+        if reranked or not rerank:
+            search_cache.set(cache_key, results)
+        return results, reranked
+
+    def resolve_mode(self, mode: str):
+        if mode == "vector" or lexical_index.ready:
+            return mode
+        if mode == "lexical":
+            raise LexicalIndexUnavailable("The lexical index is still loading; retry shortly or use mode=vector")
+        logger.warning("Lexical index is not ready; serving hybrid search from vectors only")
+        return "vector"
+
+    async def retrieve(self, query: str, limit: int, filters=None, mode: str = "vector"):
+        mode = self.resolve_mode(mode)
+        
+        if mode == "lexical":
+            lexical_hits = await self.lexical_search(query, limit, filters)
+            return self.lexical_points(lexical_hits)
+        
+        if mode == "hybrid":
+            candidates = max(limit, settings.HYBRID_CANDIDATES)
+            vector_hits, lexical_hits = await asyncio.gather(
+                self.vector_search(query, candidates, filters),
+                self.lexical_search(query, candidates, filters)
+            )
+            return self.fuse(vector_hits, lexical_hits, limit)
+        
+        return await self.vector_search(query, limit, filters)
+
+    async def retrieve_batch(self, searches: list):
+        modes = [self.resolve_mode(mode) for _, _, _, mode in searches]
+        vector_indexes = [index for index, mode in enumerate(modes) if mode != "lexical"]
+        lexical_indexes = [index for index, mode in enumerate(modes) if mode != "vector"]
+        
+        def candidates(index: int):
+            limit = searches[index][1]
+            return max(limit, settings.HYBRID_CANDIDATES) if modes[index] == "hybrid" else limit
         
-        query_embedding = embedding_service.generate_embedding(query)
-        search_results = qdrant_service.search_similar(query_embedding, limit)
+        async def search_vectors():
+            if not vector_indexes:
+                return []
+            with timed("embedding"):
+                query_embeddings = await embedding_service.generate_query_embeddings_async(
+                    [searches[index][0] for index in vector_indexes]
+                )
+            with timed("vector_search"):
+                return await vector_store.search_batch(
+                    query_embeddings,
+                    [candidates(index) for index in vector_indexes],
+                    [searches[index][2] for index in vector_indexes]
+                )
+        
+        def search_lexical():
+            return [
+                lexical_index.search(searches[index][0], candidates(index), searches[index][2])
+                for index in lexical_indexes
+            ]
+        
+        async def search_lexical_async():
+            with timed("lexical_search"):
+                return await asyncio.to_thread(search_lexical)
+        
+        vector_hits, lexical_hits = await asyncio.gather(search_vectors(), search_lexical_async())
+        vector_hits = dict(zip(vector_indexes, vector_hits))
+        lexical_hits = dict(zip(lexical_indexes, lexical_hits))
         
         results = []
-        for result in search_results:
-            tool_id = result.payload["id"]
-            tool = db.query(Tool).filter(Tool.id == tool_id).first()
-            if tool:
-                results.append({
-                    "id": str(tool.id),
-                    "name": tool.name,
-                    "description": tool.description,
-                    "tags": tool.tags,
-                    "metadata": tool.metadata_,
-                    "score": result.score
-                })
-        
-        response_time = int((time.time() - start_time) * 1000)
-        
-        search_history = SearchHistory(
-            query=query,
-            results=results,
-            result_count=len(results),
-            response_time_ms=response_time
+        for index, mode in enumerate(modes):
+            if mode == "lexical":
+                results.append(self.lexical_points(lexical_hits[index]))
+            elif mode == "hybrid":
+                results.append(self.fuse(vector_hits[index], lexical_hits[index], searches[index][1]))
+            else:
+                results.append(vector_hits[index])
+        return results
+
+    def lexical_points(self, lexical_hits: list):
+        return [
+            ScoredPoint(id=tool_id, version=0, score=score, payload=self.lexical_payload(tool_id))
+            for tool_id, score in lexical_hits
+        ]
+
+    def lexical_payload(self, tool_id: str):
+        return {"id": tool_id, "name": lexical_index.name(tool_id)}
+
+    def fuse(self, vector_hits: list, lexical_hits: list, limit: int):
+        payloads = {hit.payload["id"]: hit.payload for hit in vector_hits}
+        fused = reciprocal_rank_fusion(
+            [
+                [hit.payload["id"] for hit in vector_hits],
+                [tool_id for tool_id, _ in lexical_hits]
+            ],
+            k=settings.RRF_K
         )
-        db.add(search_history)
-        db.commit()
+        return [
+            ScoredPoint(id=tool_id, version=0, score=score, payload=payloads.get(tool_id) or self.lexical_payload(tool_id))
+            for tool_id, score in fused[:limit]
+        ]
+
+    async def vector_search(self, query: str, limit: int, filters=None):
+        with timed("embedding"):
+            query_embedding = await embedding_service.generate_embedding_async(query)
+        with timed("vector_search"):
+            return await vector_store.search_similar(query_embedding, limit, filters)
+
+    async def lexical_search(self, query: str, limit: int, filters=None):
+        with timed("lexical_search"):
+            return await asyncio.to_thread(lexical_index.search, query, limit, filters)
+
+    async def hydrate_results(self, db: AsyncSession, search_results):
+        return (await self.hydrate_batch(db, [search_results]))[0]
+
+    async def hydrate_batch(self, db: AsyncSession, search_results_list: list):
+        tool_ids = {
+            result.payload["id"]
+            for search_results in search_results_list
+            for result in search_results
+            if not (settings.SEARCH_HYDRATE_FROM_PAYLOAD and SEARCH_RESULT_FIELDS.issubset(result.payload or {}))
+        }
+        tools_by_id = {}
+        if tool_ids:
+            with timed("hydration"):
+                result = await db.execute(select(Tool).where(Tool.id.in_([UUID(tool_id) for tool_id in tool_ids])))
+            tools_by_id = {str(tool.id): tool for tool in result.scalars().all()}
         
-        return results, response_time
+        hydrated = []
+        for search_results in search_results_list:
+            results = []
+            for result in search_results:
+                tool = tools_by_id.get(result.payload["id"])
+                if tool:
+                    results.append({
+                        "id": str(tool.id),
+                        "name": tool.name,
+                        "description": tool.description,
+                        "tags": tool.tags,
+                        "metadata": tool.metadata_,
+                        "score": result.score
+                    })
+                elif result.payload["id"] not in tool_ids:
+                    results.append({
+                        "id": result.payload["id"],
+                        "name": result.payload["name"],
+                        "description": result.payload["description"],
+                        "tags": result.payload["tags"],
+                        "metadata": result.payload["metadata"],
+                        "score": result.score
+                    })
+            hydrated.append(results)
+        return hydrated
 
 
 tool_service = ToolService()
\ No newline at end of file
@@ -0,0 +1,22 @@
+from app.services.memory_vector_store import InMemoryVectorStore
+from app.services.qdrant_service import qdrant_service
+from app.config.settings import settings
+
+
+def create_vector_store():
+    if settings.VECTOR_STORE_BACKEND == "memory":
+        return InMemoryVectorStore(
+            dimension=settings.vector_dimension,
+            index_type=settings.VECTOR_STORE_INDEX,
+            nlist=settings.VECTOR_STORE_IVF_NLIST,
+            nprobe=settings.VECTOR_STORE_IVF_NPROBE,
+            snapshot_path=settings.VECTOR_STORE_SNAPSHOT_PATH,
+            quantization=settings.VECTOR_QUANTIZATION,
+            rescore=settings.SEARCH_RESCORE,
+            oversampling=settings.SEARCH_OVERSAMPLING
+        )
+
+    return qdrant_service
+
+
+vector_store = create_vector_store()
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.postgres import AsyncSessionLocal
+from app.models.tool import Tool
+from app.models.vector_outbox import VectorOutbox
+from app.services.embedding_store import embedding_store
+from app.services.vector_backend import vector_store
+from app.services.search_cache import search_cache
+from app.services.tool_documents import build_tool_payload, build_point_id
+from app.services.metrics import timed, observe_batch
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+REPORT_SAMPLE_SIZE = 20
+
+
+def enqueue_vector_write(db: AsyncSession, tool_id, operation: str, point_id: str):
+    db.add(VectorOutbox(tool_id=tool_id, operation=operation, point_id=point_id))
+
+
+class VectorOutboxWorker:
+    def __init__(self):
+        self.enabled = settings.VECTOR_OUTBOX_WORKER_ENABLED
+        self.batch_size = settings.VECTOR_OUTBOX_BATCH_SIZE
+        self.poll_interval = settings.VECTOR_OUTBOX_POLL_INTERVAL_MS / 1000
+        self.max_attempts = settings.VECTOR_OUTBOX_MAX_ATTEMPTS
+        self.retry_backoff = settings.VECTOR_OUTBOX_RETRY_BACKOFF_SECONDS
+        self.processed = 0
+        self.failures = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    async def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def notify(self):
+        self._wakeup.set()
+
+    async def drain(self):
+        async with AsyncSessionLocal() as db:
+            entries = (await db.execute(
+                select(VectorOutbox)
+                .where(VectorOutbox.available_at <= func.now(), VectorOutbox.attempts < self.max_attempts)
+                .order_by(VectorOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+            if not entries:
+                return 0
+
+            observe_batch("vector_outbox", len(entries))
+            with timed("outbox_apply"):
+                try:
+                    await self.apply_separately(entries)
+                    errors = {}
+                except Exception as error:
+                    errors = await self.apply_each(entries) if len(entries) > 1 else {entries[0].id: error}
+
+            done = [entry.id for entry in entries if entry.id not in errors]
+            if done:
+                await db.execute(delete(VectorOutbox).where(VectorOutbox.id.in_(done)))
+            for entry in entries:
+                error = errors.get(entry.id)
+                if error is not None:
+                    entry.attempts += 1
+                    entry.last_error = repr(error)
+                    entry.available_at = datetime.now(timezone.utc) + timedelta(
+                        seconds=min(self.retry_backoff * 2 ** (entry.attempts - 1), 3600)
+                    )
+                    logger.warning(
+                        "Vector %s for tool %s failed (attempt %d): %r",
+                        entry.operation, entry.tool_id, entry.attempts, error
+                    )
+            await db.commit()
+
+        self.processed += len(done)
+        self.failures += len(errors)
+        search_cache.invalidate()
+        return len(entries)
+
+    async def apply(self, db: AsyncSession, entries: list):
+        latest = {}
+        for entry in entries:
+            previous = latest.get(entry.tool_id)
+            if previous is None or previous.operation != "upsert" or entry.operation != "payload":
+                latest[entry.tool_id] = entry
+        deletes = [entry.point_id for entry in latest.values() if entry.operation == "delete"]
+        writes = {entry.tool_id: entry.operation for entry in latest.values() if entry.operation != "delete"}
+
+        if writes:
+            tools = (await db.execute(select(Tool).where(Tool.id.in_(list(writes))))).scalars().all()
+            upserts = [tool for tool in tools if writes[tool.id] == "upsert"]
+            payload_updates = [tool for tool in tools if writes[tool.id] == "payload"]
+            if upserts:
+                await vector_store.upsert_vectors(
+                    [tool.vector_id or build_point_id(tool.id) for tool in upserts],
+                    await embedding_store.embed_tools(db, upserts),
+                    [build_tool_payload(tool) for tool in upserts]
+                )
+            if payload_updates:
+                await vector_store.set_payloads(
+                    [tool.vector_id for tool in payload_updates],
+                    [build_tool_payload(tool) for tool in payload_updates]
+                )
+        if deletes:
+            await vector_store.delete_vectors(deletes)
+
+    async def apply_separately(self, entries: list):
+        async with AsyncSessionLocal() as db:
+            await self.apply(db, entries)
+            await db.commit()
+
+    async def apply_each(self, entries: list):
+        errors = {}
+        for entry in entries:
+            try:
+                await self.apply_separately([entry])
+            except Exception as error:
+                errors[entry.id] = error
+        return errors
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                drained = await self.drain()
+            except Exception:
+                logger.exception("Failed to drain the vector outbox")
+                drained = 0
+            if drained < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+async def reconcile(db: AsyncSession, repair: bool = False, chunk_size: int = settings.INGEST_CHUNK_SIZE):
+    pending = await db.scalar(select(func.count()).select_from(VectorOutbox))
+    oldest_pending = await db.scalar(select(func.min(VectorOutbox.created_at)))
+    failed = (await db.execute(
+        select(VectorOutbox).where(VectorOutbox.attempts >= settings.VECTOR_OUTBOX_MAX_ATTEMPTS)
+    )).scalars().all()
+    queued = set((await db.execute(select(VectorOutbox.tool_id))).scalars())
+
+    unindexed = []
+    missing = []
+    last_id = None
+    while True:
+        query = select(Tool.id, Tool.vector_id).order_by(Tool.id).limit(chunk_size)
+        if last_id is not None:
+            query = query.where(Tool.id > last_id)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            break
+
+        unindexed.extend(tool_id for tool_id, vector_id in rows if vector_id is None and tool_id not in queued)
+        stored = await vector_store.contains([vector_id for _, vector_id in rows if vector_id])
+        missing.extend(
+            (tool_id, vector_id) for tool_id, vector_id in rows
+            if vector_id and vector_id not in stored and tool_id not in queued
+        )
+        last_id = rows[-1][0]
+
+    orphans = []
+    async for points in vector_store.scroll_points(chunk_size):
+        known = set((await db.execute(
+            select(Tool.vector_id).where(Tool.vector_id.in_([point_id for point_id, _ in points]))
+        )).scalars())
+        orphans.extend((point_id, tool_id) for point_id, tool_id in points if point_id not in known)
+
+    if repair:
+        for tool_id in unindexed:
+            await db.execute(update(Tool).where(Tool.id == tool_id).values(vector_id=build_point_id(tool_id)))
+            enqueue_vector_write(db, tool_id, "upsert", build_point_id(tool_id))
+        for tool_id, vector_id in missing:
+            enqueue_vector_write(db, tool_id, "upsert", vector_id)
+        for point_id, tool_id in orphans:
+            enqueue_vector_write(db, UUID(tool_id) if tool_id else UUID(point_id), "delete", point_id)
+        for entry in failed:
+            entry.attempts = 0
+            entry.available_at = func.now()
+        await db.commit()
+
+    return {
+        "pending": pending,
+        "oldest_pending_at": oldest_pending.isoformat() if oldest_pending else None,
+        "failed": [
+            {
+                "tool_id": str(entry.tool_id),
+                "operation": entry.operation,
+                "attempts": entry.attempts,
+                "last_error": entry.last_error
+            }
+            for entry in failed[:REPORT_SAMPLE_SIZE]
+        ],
+        "failed_count": len(failed),
+        "unindexed_count": len(unindexed),
+        "missing_vectors_count": len(missing),
+        "missing_vectors": [str(tool_id) for tool_id, _ in missing[:REPORT_SAMPLE_SIZE]],
+        "orphan_points_count": len(orphans),
+        "orphan_points": [point_id for point_id, _ in orphans[:REPORT_SAMPLE_SIZE]],
+        "repaired": repair
+    }
+
+
+vector_outbox_worker = VectorOutboxWorker()
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+
+
+class VectorStore(ABC):
+    ready = True
+
+    async def start(self):
+        pass
+
+    @abstractmethod
+    async def insert_vector(self, vector: list, payload: dict):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_vectors(self, point_ids: list, vectors: list, payloads: list, collection_name: str = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_similar(self, query_vector: list, limit: int = 5, filters=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def search_batch(self, query_vectors: list, limits: list, filters_list: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_vector(self, point_id: str, vector: list, payload: dict):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_payloads(self, point_ids: list, payloads: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_vector(self, point_id: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_vectors(self, point_ids: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def contains(self, point_ids: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_payloads(self, point_ids: list):
+        raise NotImplementedError
+
+    @abstractmethod
+    def scroll_points(self, batch_size: int = 256):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
@@ -0,0 +1,99 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+from benchmarks.embedding_batching import QUERIES
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def load_backend(backend: str, model_name: str, onnx_path: str, threads: int):
+    if backend == "torch":
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if threads > 0:
+            torch.set_num_threads(threads)
+        return SentenceTransformer(model_name, device="cpu")
+
+    from app.services.onnx_encoder import OnnxEncoder
+
+    return OnnxEncoder(onnx_path, quantized=backend == "onnx-int8", intra_op_threads=threads)
+
+
+def run_backend(args):
+    started = time.perf_counter()
+    model = load_backend(args.worker, args.model, args.onnx_path, args.threads)
+    load_seconds = time.perf_counter() - started
+
+    for text in QUERIES:
+        model.encode(text)
+
+    latencies = []
+    for index in range(args.queries):
+        text = f"{QUERIES[index % len(QUERIES)]} {index}"
+        started = time.perf_counter()
+        model.encode(text)
+        latencies.append(time.perf_counter() - started)
+
+    texts = [f"{QUERIES[index % len(QUERIES)]} {index}" for index in range(args.batch_size * 8)]
+    started = time.perf_counter()
+    model.encode(texts)
+    batch_seconds = time.perf_counter() - started
+
+    with open("/proc/self/statm") as statm:
+        rss_pages = int(statm.read().split()[1])
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "backend": args.worker,
+        "load_seconds": load_seconds,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "batch_texts_per_second": len(texts) / batch_seconds,
+        "rss_mb": rss_pages * resource.getpagesize() / 2 ** 20,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare encode latency and memory of the embedding backends")
+    parser.add_argument("--model", default="sentence-transformers/all-mpnet-base-v2")
+    parser.add_argument("--onnx-path", default="./models/onnx", help="directory written by export_onnx_model.py")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads (0 keeps the library default)")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args)))
+        return
+
+    results = []
+    print(f"{'backend':>10} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {'batch/s':>9} {'rss MB':>8} {'peak MB':>8}")
+    for backend in args.backends.split(","):
+        command = [
+            sys.executable, "-m", "benchmarks.embedding_backends", "--worker", backend,
+            "--model", args.model, "--onnx-path", args.onnx_path, "--threads", str(args.threads),
+            "--queries", str(args.queries), "--batch-size", str(args.batch_size),
+        ]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{backend:>10} {result['load_seconds']:>7.2f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+            f"{result['batch_texts_per_second']:>9.1f} {result['rss_mb']:>8.1f} {result['peak_rss_mb']:>8.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
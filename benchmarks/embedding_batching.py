@@ -0,0 +1,113 @@
+import argparse
+import json
+import threading
+import time
+import numpy as np
+from app.services.embedding_batcher import EmbeddingBatcher
+
+QUERIES = [
+    "machine learning framework",
+    "database for caching",
+    "containerization tools",
+    "frontend javascript library",
+    "vector database for semantic search",
+    "experiment tracking for ml models",
+    "ci cd automation server",
+    "distributed computing in python",
+]
+
+
+class SimulatedEncoder:
+    def __init__(self, dimension: int = 384, overhead_ms: float = 8, per_item_ms: float = 1):
+        self.dimension = dimension
+        self.overhead = overhead_ms / 1000
+        self.per_item = per_item_ms / 1000
+        self._cpu = threading.Lock()
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        count = 1 if single else len(texts)
+        with self._cpu:
+            time.sleep(self.overhead + self.per_item * count)
+        embeddings = np.zeros((count, self.dimension), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def run_load(embed, concurrency: int, duration: float):
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker(worker_id: int):
+        local = []
+        index = worker_id
+        while time.perf_counter() < stop_at:
+            text = f"{QUERIES[index % len(QUERIES)]} {index}"
+            started = time.perf_counter()
+            embed(text)
+            local.append(time.perf_counter() - started)
+            index += concurrency
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "qps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-query and micro-batched embedding throughput")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--simulate", action="store_true", help="use a simulated encoder instead of loading a model")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=2)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.simulate:
+        model = SimulatedEncoder()
+    else:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(args.model)
+
+    batcher = EmbeddingBatcher(model.encode, args.max_batch_size, args.max_wait_ms)
+    results = []
+
+    print(f"{'concurrency':>11} {'mode':>9} {'qps':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for concurrency in [int(value) for value in args.concurrency.split(",")]:
+        for mode, embed in (("unbatched", model.encode), ("batched", batcher.embed)):
+            batches_before, items_before = batcher.batches, batcher.batched_items
+            result = run_load(embed, concurrency, args.duration)
+            result.update({"concurrency": concurrency, "mode": mode})
+            if mode == "batched":
+                batches = batcher.batches - batches_before
+                result["mean_batch_size"] = (batcher.batched_items - items_before) / batches if batches else 0
+            results.append(result)
+            print(
+                f"{concurrency:>11} {mode:>9} {result['qps']:>9.1f} "
+                f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+            )
+
+    batcher.stop()
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
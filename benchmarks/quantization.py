@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+import numpy as np
+from app.services.memory_vector_store import InMemoryVectorStore, normalize
+
+
+def synthetic_embeddings(count: int, dimension: int, clusters: int, rng):
+    decay = 1 / np.sqrt(np.arange(1, dimension + 1))
+    centers = rng.standard_normal((clusters, dimension)) * decay
+    labels = rng.integers(clusters, size=count)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((count, dimension)) * decay
+    return normalize(vectors)
+
+
+def exact_neighbours(vectors, queries, k: int):
+    scores = queries @ vectors.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def run_config(vectors, queries, truth, k: int, dimension: int, quantization: str, rescore: bool, oversampling: float):
+    store = InMemoryVectorStore(dimension, quantization=quantization, rescore=rescore, oversampling=oversampling)
+    truncated = normalize(vectors[:, :dimension])
+    store.upsert([str(index) for index in range(len(vectors))], truncated, [{} for _ in range(len(vectors))])
+
+    latencies = []
+    hits = 0
+    for query, expected in zip(normalize(queries[:, :dimension]), truth):
+        started = time.perf_counter()
+        results = store.search(query, limit=k)
+        latencies.append(time.perf_counter() - started)
+        hits += len(expected & {int(point.id) for point in results})
+
+    usage = store.memory_usage()
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "dimension": dimension,
+        "quantization": quantization,
+        "rescore": rescore,
+        "recall_at_k": hits / (len(truth) * k),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "resident_bytes": usage["resident_bytes"],
+        "disk_bytes": usage["vectors_bytes"] if usage["vectors_on_disk"] else 0,
+        "compression": len(vectors) * vectors.shape[1] * 4 / usage["resident_bytes"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare recall and latency of quantized and truncated vectors")
+    parser.add_argument("--vectors", help="corpus embeddings as a .npy file; synthetic vectors are used otherwise")
+    parser.add_argument("--queries", help="query embeddings as a .npy file; sampled from the corpus otherwise")
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--query-count", type=int, default=200)
+    parser.add_argument("--dims", default="", help="comma-separated truncated dimensions to test")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.vectors:
+        vectors = normalize(np.load(args.vectors))
+    else:
+        vectors = synthetic_embeddings(args.count, args.dimension, max(args.count // 100, 1), rng)
+    if args.queries:
+        queries = normalize(np.load(args.queries))
+    else:
+        sample = vectors[rng.choice(len(vectors), size=args.query_count, replace=False)]
+        queries = normalize(sample + 0.05 * rng.standard_normal(sample.shape).astype(np.float32))
+
+    truth = exact_neighbours(vectors, queries, args.k)
+    dimensions = [vectors.shape[1]] + [int(value) for value in args.dims.split(",") if value]
+    results = []
+
+    print(f"{'dim':>5} {'quant':>7} {'rescore':>8} {'recall':>7} {'p50 ms':>8} {'p99 ms':>8} {'in RAM':>9} {'memory':>7}")
+    for dimension in dimensions:
+        for quantization, rescore in (("none", False), ("int8", False), ("int8", True), ("binary", False), ("binary", True)):
+            result = run_config(vectors, queries, truth, args.k, dimension, quantization, rescore, args.oversampling)
+            results.append(result)
+            print(
+                f"{dimension:>5} {quantization:>7} {str(rescore):>8} {result['recall_at_k']:>7.3f} "
+                f"{result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['resident_bytes'] / 2 ** 20:>6.1f}MiB "
+                f"{result['compression']:>6.1f}x"
+            )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
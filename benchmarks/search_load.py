@@ -0,0 +1,304 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+SYLLABLES = [
+    "ka", "lo", "mi", "ta", "ren", "so", "vu", "dex", "pi", "zor", "qua", "nel", "bri", "os", "tek",
+    "fa", "gul", "hy", "jo", "mer", "ny", "plo", "ris", "sem", "tor", "ul", "vex", "wa", "xi", "yor"
+]
+CATEGORIES = ["database", "testing", "machine-learning", "devops", "frontend", "security", "data", "monitoring"]
+TOKEN = re.compile(r"\w+")
+
+
+class HashingEncoder:
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._tokens = {}
+
+    def token_vector(self, token: str):
+        vector = self._tokens.get(token)
+        if vector is None:
+            seed = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32)
+            self._tokens[token] = vector
+        return vector
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        embeddings = np.zeros((len(batch), self.dimension), dtype=np.float32)
+        for row, text in enumerate(batch):
+            for token in TOKEN.findall(text.lower()):
+                embeddings[row] += self.token_vector(token)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings[0] if single else embeddings
+
+
+def zipf_probabilities(size: int, exponent: float):
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return weights / weights.sum()
+
+
+def build_vocabulary(size: int):
+    words = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+    return words[:size]
+
+
+def generate_tools(start: int, count: int, vocabulary: list, word_probabilities, rng, words_per_tool: int = 12):
+    words = rng.choice(len(vocabulary), size=(count, words_per_tool), p=word_probabilities)
+    categories = rng.integers(len(CATEGORIES), size=count)
+    return [
+        {
+            "name": f"{vocabulary[row[0]]}-{vocabulary[row[1]]} {start + index}",
+            "description": " ".join(vocabulary[word] for word in row),
+            "tags": [vocabulary[row[2]], CATEGORIES[categories[index]]],
+            "metadata": {"category": CATEGORIES[categories[index]]}
+        }
+        for index, row in enumerate(words)
+    ]
+
+
+def generate_queries(count: int, vocabulary: list, word_probabilities, rng):
+    lengths = rng.integers(2, 5, size=count)
+    return [
+        " ".join(vocabulary[word] for word in rng.choice(len(vocabulary), size=length, p=word_probabilities))
+        for length in lengths
+    ]
+
+
+def configure_environment(args, workdir: str):
+    for name, value in {
+        "POSTGRES_DB": "bench", "POSTGRES_USER": "bench", "POSTGRES_PASSWORD": "bench",
+        "POSTGRES_HOST": "localhost", "POSTGRES_PORT": "5432",
+        "QDRANT_HOST": "localhost", "QDRANT_PORT": "6333", "QDRANT_COLLECTION_NAME": "tools",
+        "PGADMIN_EMAIL": "bench@example.com", "PGADMIN_PASSWORD": "bench", "PGADMIN_PORT": "5050",
+        "API_HOST": "127.0.0.1", "API_PORT": "8000",
+    }.items():
+        os.environ.setdefault(name, value)
+    for name in ("EMBEDDING_TRUNCATE_DIM", "VECTOR_STORE_SNAPSHOT_PATH", "EMBEDDING_CACHE_PATH"):
+        os.environ.pop(name, None)
+    os.environ.update({
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}",
+        "EMBEDDING_MODEL": "benchmark-hashing-encoder",
+        "EMBEDDING_BACKEND": "torch",
+        "VECTOR_SIZE": str(args.dimension),
+        "VECTOR_STORE_BACKEND": "memory",
+        "VECTOR_STORE_INDEX": args.index,
+        "VECTOR_QUANTIZATION": args.quantization,
+        "LEXICAL_INDEX_ENABLED": "false" if args.mode == "vector" else "true",
+        "RERANK_ENABLED": "false",
+        "SEARCH_CACHE_SIZE": str(args.search_cache_size),
+        "INGEST_CHUNK_SIZE": str(args.ingest_batch_size),
+    })
+
+
+def percentile_ms(latencies, q: float):
+    return float(np.percentile(latencies, q) * 1000) if len(latencies) else None
+
+
+def rss_mb():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 2 ** 20
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def exact_recall(client, vector_store, encoder, queries: list, limit: int, mode: str):
+    count = len(vector_store)
+    vectors = vector_store.vectors[:count]
+    tool_ids = [payload["id"] for payload in vector_store.payloads]
+    recalls = []
+    for query in queries:
+        scores = vectors @ encoder.encode(query)
+        top = np.argpartition(-scores, min(limit, count - 1))[:limit]
+        expected = {tool_ids[row] for row in top}
+        response = client.post("/search/", json={"query": query, "limit": limit, "mode": mode})
+        returned = {result["id"] for result in response.json()["results"]}
+        recalls.append(len(expected & returned) / len(expected))
+    return float(np.mean(recalls))
+
+
+def run_load(client, queries: list, workload, limit: int, mode: str, concurrency: int):
+    latencies = np.zeros(len(workload))
+    errors = 0
+    lock = threading.Lock()
+
+    def search(index: int):
+        nonlocal errors
+        started = time.perf_counter()
+        response = client.post("/search/", json={"query": queries[workload[index]], "limit": limit, "mode": mode})
+        latencies[index] = time.perf_counter() - started
+        if response.status_code != 200:
+            with lock:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(search, range(len(workload))))
+    return time.perf_counter() - started, latencies, errors
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="tool-search-bench-")
+    configure_environment(args, workdir)
+
+    from fastapi.testclient import TestClient
+    from app.database.postgres import Base, engine
+    from app.models import reindex_checkpoint, search_history, tool
+    from app.main import app
+    from app.services.embedding_service import embedding_service
+    from app.services.metrics import stage_seconds
+    from app.services.search_cache import search_cache
+    from app.services.vector_backend import vector_store
+
+    Base.metadata.create_all(engine)
+    encoder = HashingEncoder(args.dimension)
+    embedding_service._model = encoder
+
+    rng = np.random.default_rng(args.seed)
+    vocabulary = build_vocabulary(args.vocabulary)
+    word_probabilities = zipf_probabilities(len(vocabulary), args.word_zipf)
+    queries = generate_queries(args.distinct_queries, vocabulary, word_probabilities, rng)
+    workload = rng.choice(len(queries), size=args.requests, p=zipf_probabilities(len(queries), args.zipf))
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 60
+        while client.get("/health/ready").status_code != 200:
+            if time.monotonic() > deadline:
+                raise RuntimeError("API did not become ready")
+            time.sleep(0.05)
+
+        started = time.perf_counter()
+        for start in range(0, args.tools, args.ingest_batch_size):
+            count = min(args.ingest_batch_size, args.tools - start)
+            tools = generate_tools(start, count, vocabulary, word_probabilities, rng)
+            response = client.post("/tools/bulk", json={"tools": tools})
+            response.raise_for_status()
+        deadline = time.monotonic() + 600
+        while len(vector_store) < args.tools:
+            if time.monotonic() > deadline:
+                raise RuntimeError("The vector outbox did not drain")
+            time.sleep(0.05)
+        ingest_seconds = time.perf_counter() - started
+
+        warmup = min(args.warmup, len(workload))
+        run_load(client, queries, workload[:warmup], args.limit, args.mode, args.concurrency)
+        before = stage_seconds.totals()
+        seconds, latencies, errors = run_load(client, queries, workload, args.limit, args.mode, args.concurrency)
+        cache_stats = search_cache.stats()
+        stages = {
+            stage: (total - before.get((stage,), (0, 0.0))[1]) / len(workload) * 1000
+            for (stage,), (_, total) in stage_seconds.totals().items()
+        }
+
+        recall = None
+        if args.mode == "vector" and args.recall_queries > 0:
+            search_cache.invalidate()
+            recall = exact_recall(client, vector_store, encoder, queries[:args.recall_queries], args.limit, args.mode)
+
+        return {
+            "commit": git_commit(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+            "ingest": {
+                "tools": args.tools,
+                "seconds": ingest_seconds,
+                "tools_per_second": args.tools / ingest_seconds
+            },
+            "search": {
+                "requests": len(workload),
+                "errors": errors,
+                "seconds": seconds,
+                "qps": len(workload) / seconds,
+                "p50_ms": percentile_ms(latencies, 50),
+                "p95_ms": percentile_ms(latencies, 95),
+                "p99_ms": percentile_ms(latencies, 99),
+                "max_ms": float(latencies.max() * 1000),
+                "cache_hit_ratio": cache_stats["hit_ratio"],
+                "stage_ms_per_request": stages
+            },
+            "recall_at_k": recall,
+            "memory": {
+                "rss_mb": rss_mb(),
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                **vector_store.memory_usage()
+            }
+        }
+
+
+def compare(report: dict, baseline: dict):
+    rows = [
+        ("search", "qps"), ("search", "p50_ms"), ("search", "p95_ms"), ("search", "p99_ms"),
+        ("ingest", "tools_per_second"), ("memory", "rss_mb"), (None, "recall_at_k"),
+    ]
+    print(f"{'metric':>24} {'baseline':>12} {'current':>12} {'change':>9}")
+    for section, key in rows:
+        current = report[section][key] if section else report[key]
+        previous = baseline[section][key] if section else baseline[key]
+        if current is None or previous is None:
+            continue
+        change = f"{(current - previous) / previous * 100:+.1f}%" if previous else "n/a"
+        print(f"{key:>24} {previous:>12.3f} {current:>12.3f} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the search API in-process against SQLite, the in-memory vector store and a hashing encoder"
+    )
+    parser.add_argument("--tools", type=int, default=1000, help="synthetic catalog size")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--mode", choices=("vector", "hybrid", "lexical"), default="vector")
+    parser.add_argument("--index", choices=("exact", "ivf"), default="exact")
+    parser.add_argument("--quantization", choices=("none", "int8", "binary"), default="none")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--distinct-queries", type=int, default=1000)
+    parser.add_argument("--zipf", type=float, default=1.1, help="exponent of the query popularity distribution")
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--word-zipf", type=float, default=1.0, help="exponent of the word frequency distribution")
+    parser.add_argument("--search-cache-size", type=int, default=1000, help="0 disables the search result cache")
+    parser.add_argument("--ingest-batch-size", type=int, default=1000)
+    parser.add_argument("--recall-queries", type=int, default=200, help="queries checked against exact search")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    report = run(args)
+    search = report["search"]
+    print(
+        f"{search['qps']:.1f} req/s  p50 {search['p50_ms']:.2f} ms  p95 {search['p95_ms']:.2f} ms  "
+        f"p99 {search['p99_ms']:.2f} ms  errors {search['errors']}  "
+        f"recall@{args.limit} {report['recall_at_k'] if report['recall_at_k'] is not None else 'n/a'}  "
+        f"rss {report['memory']['rss_mb']:.0f} MB"
+    )
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            compare(report, json.load(baseline_file))
+    if search["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,24 @@ CREATE TABLE IF NOT EXISTS tools (
     tags TEXT[] DEFAULT '{}',
     metadata JSONB DEFAULT '{}',
     vector_id VARCHAR(255) UNIQUE,
+    content_hash VARCHAR(64),
+    embedding_model VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
+ALTER TABLE tools ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE tools ADD COLUMN IF NOT EXISTS embedding_model VARCHAR(255);
+
+CREATE TABLE IF NOT EXISTS reindex_checkpoints (
+    job_name VARCHAR(255) PRIMARY KEY,
+    model_fingerprint VARCHAR(255) NOT NULL,
+    last_updated_at TIMESTAMP WITH TIME ZONE,
+    last_id UUID,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
 CREATE TABLE IF NOT EXISTS search_history (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     query TEXT NOT NULL,
@@ -20,11 +34,32 @@ CREATE TABLE IF NOT EXISTS search_history (
     response_time_ms INTEGER DEFAULT 0
 );
 
+CREATE TABLE IF NOT EXISTS vector_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    tool_id UUID NOT NULL,
+    operation VARCHAR(16) NOT NULL,
+    point_id VARCHAR(255) NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    available_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS tool_embeddings (
+    content_hash VARCHAR(64) NOT NULL,
+    embedding_model VARCHAR(255) NOT NULL,
+    vector BYTEA NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (content_hash, embedding_model)
+);
+
 CREATE INDEX IF NOT EXISTS idx_tools_name ON tools(name);
 CREATE INDEX IF NOT EXISTS idx_tools_tags ON tools USING GIN(tags);
 CREATE INDEX IF NOT EXISTS idx_tools_metadata ON tools USING GIN(metadata);
-CREATE INDEX IF NOT EXISTS idx_tools_created_at ON tools(created_at);
+CREATE INDEX IF NOT EXISTS idx_tools_created_at_id ON tools(created_at, id);
 CREATE INDEX IF NOT EXISTS idx_tools_vector_id ON tools(vector_id);
+CREATE INDEX IF NOT EXISTS idx_tools_updated_at_id ON tools(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_vector_outbox_available_at ON vector_outbox(available_at, id);
 CREATE INDEX IF NOT EXISTS idx_search_history_timestamp ON search_history(search_timestamp);
 CREATE INDEX IF NOT EXISTS idx_search_history_query ON search_history(query);
 
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+from app.config.settings import settings
+from app.services.onnx_encoder import OnnxEncoder, CONFIG_FILE, MODEL_FILE, QUANTIZED_MODEL_FILE
+
+PARITY_TEXTS = [
+    "TensorFlow End-to-end open source machine learning platform machine-learning deep-learning",
+    "PostgreSQL Powerful open source relational database database sql",
+    "Redis In-memory data structure store used as a cache and message broker cache nosql",
+    "Docker Platform for developing, shipping and running applications in containers containers devops",
+    "vector database for semantic search",
+    "ci cd automation server",
+]
+
+def export_model(model_name: str, output_dir: str, opset: int):
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+    
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    pooling = next(module for module in model if isinstance(module, Pooling))
+    
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+    
+    sample = tokenizer(PARITY_TEXTS[:2], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    
+    class TokenEmbeddings(torch.nn.Module):
+        def forward(self, *inputs):
+            return transformer(**dict(zip(input_names, inputs))).last_hidden_state
+    
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["token_embeddings"]}
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(),
+            tuple(sample[name] for name in input_names),
+            os.path.join(output_dir, MODEL_FILE),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    
+    with open(os.path.join(output_dir, CONFIG_FILE), "w") as config_file:
+        json.dump({
+            "model": model_name,
+            "max_seq_length": model.max_seq_length,
+            "pooling": "cls" if pooling.pooling_mode_cls_token else "mean",
+            "normalize": any(isinstance(module, Normalize) for module in model),
+            "pad_token_id": tokenizer.pad_token_id or 0
+        }, config_file, indent=2)
+    
+    return model
+
+def quantize_model(output_dir: str):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantize_dynamic(
+        os.path.join(output_dir, MODEL_FILE),
+        os.path.join(output_dir, QUANTIZED_MODEL_FILE),
+        weight_type=QuantType.QInt8
+    )
+
+def check_parity(reference, output_dir: str, quantized: bool, min_cosine: float):
+    candidate = OnnxEncoder(output_dir, quantized=quantized).encode(PARITY_TEXTS)
+    cosine = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+    max_difference = float(np.abs(reference - candidate).max())
+    passed = float(cosine.min()) >= min_cosine
+    
+    label = "int8" if quantized else "fp32"
+    status = "ok" if passed else "FAILED"
+    print(f"{label}: min cosine {cosine.min():.5f}, max abs diff {max_difference:.5f} ({status})")
+    return passed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the embedding model to ONNX and check it against the torch model")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL)
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_PATH)
+    parser.add_argument("--quantize", action="store_true", help="also write a dynamically int8-quantized model")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--min-cosine", type=float, default=0.9999)
+    parser.add_argument("--min-cosine-int8", type=float, default=0.98)
+    args = parser.parse_args()
+    
+    model = export_model(args.model, args.output, args.opset)
+    if args.quantize:
+        quantize_model(args.output)
+    
+    reference = model.encode(PARITY_TEXTS)
+    passed = check_parity(reference, args.output, False, args.min_cosine)
+    if args.quantize:
+        passed = check_parity(reference, args.output, True, args.min_cosine_int8) and passed
+    print(f"ONNX model written to {args.output}")
+    sys.exit(0 if passed else 1)
\ No newline at end of file
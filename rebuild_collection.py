@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+from app.database.postgres import AsyncSessionLocal
+from app.services.collection_rebuild import collection_rebuilder
+from app.services.embedding_service import embedding_service
+from app.services.qdrant_service import qdrant_service
+
+def print_progress(stats):
+    print(f"Rebuild progress: {stats}")
+
+async def rebuild_collection(swap: bool = True, keep_old: bool = False, swap_to: str = None, migrate_legacy: bool = False):
+    async with AsyncSessionLocal() as db:
+        if migrate_legacy:
+            collection_name = await collection_rebuilder.migrate_legacy_collection(db)
+            if collection_name:
+                print(f"Copied the legacy collection into {collection_name}; the alias now points to it")
+            else:
+                print("Nothing to migrate: the collection name is already an alias")
+        elif swap_to:
+            await collection_rebuilder.verify(db, swap_to)
+            await collection_rebuilder.swap(db, swap_to, keep_old=keep_old)
+            print(f"Alias now points to {swap_to}")
+        else:
+            collection_name, stats = await collection_rebuilder.rebuild(
+                db, swap=swap, keep_old=keep_old, progress=print_progress
+            )
+            state = "serving" if swap else "built, not swapped"
+            print(f"Rebuild complete! {collection_name} ({state}): {stats}")
+    
+    embedding_service.shutdown()
+    await qdrant_service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the tools collection in a shadow copy and swap the alias")
+    parser.add_argument("--no-swap", action="store_true", help="build and verify the shadow collection only")
+    parser.add_argument("--swap-to", help="verify an existing shadow collection and point the alias at it")
+    parser.add_argument("--keep-old", action="store_true", help="keep the previous collection after swapping")
+    parser.add_argument("--migrate-legacy", action="store_true", help="turn a plain collection named QDRANT_COLLECTION_NAME into an alias")
+    args = parser.parse_args()
+    asyncio.run(rebuild_collection(
+        swap=not args.no_swap, keep_old=args.keep_old, swap_to=args.swap_to, migrate_legacy=args.migrate_legacy
+    ))
\ No newline at end of file
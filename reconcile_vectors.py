@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import json
+from app.database.postgres import AsyncSessionLocal
+from app.services.embedding_service import embedding_service
+from app.services.vector_backend import vector_store
+from app.services.vector_outbox import reconcile
+
+def print_report(report):
+    print(f"Pending outbox entries: {report['pending']} (oldest: {report['oldest_pending_at']})")
+    print(f"Failed outbox entries: {report['failed_count']}")
+    for entry in report["failed"]:
+        print(f"  {entry['operation']} {entry['tool_id']} after {entry['attempts']} attempts: {entry['last_error']}")
+    print(f"Tools without a vector id: {report['unindexed_count']}")
+    print(f"Tools missing from the vector store: {report['missing_vectors_count']}")
+    for tool_id in report["missing_vectors"]:
+        print(f"  {tool_id}")
+    print(f"Orphan points in the vector store: {report['orphan_points_count']}")
+    for point_id in report["orphan_points"]:
+        print(f"  {point_id}")
+    if report["repaired"]:
+        print("Repairs were queued on the vector outbox")
+
+async def reconcile_vectors(repair: bool = False, as_json: bool = False):
+    await vector_store.start()
+    async with AsyncSessionLocal() as db:
+        report = await reconcile(db, repair=repair)
+        
+        if as_json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_report(report)
+    
+    embedding_service.shutdown()
+    await vector_store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report drift between Postgres tools and the vector store")
+    parser.add_argument("--repair", action="store_true", help="queue outbox entries that fix the drift and retry failed ones")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    asyncio.run(reconcile_vectors(repair=args.repair, as_json=args.json))
\ No newline at end of file
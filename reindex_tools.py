@@ -0,0 +1,24 @@
+import argparse
+import asyncio
+from app.database.postgres import AsyncSessionLocal
+from app.services.embedding_service import embedding_service
+from app.services.vector_backend import vector_store
+from app.services.reindex_service import reindex_job
+
+def print_progress(stats):
+    print(f"Re-index progress: {stats}")
+
+async def reindex_tools(full: bool = False):
+    async with AsyncSessionLocal() as db:
+        stats = await reindex_job.run(db, full=full, progress=print_progress)
+        
+        print(f"Re-index complete! {stats}")
+    
+    embedding_service.shutdown()
+    await vector_store.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-embed tools whose text or embedding model changed")
+    parser.add_argument("--full", action="store_true", help="ignore the checkpoint and rescan every tool")
+    args = parser.parse_args()
+    asyncio.run(reindex_tools(full=args.full))
\ No newline at end of file
@@ -0,0 +1,53 @@
+import argparse
+import logging
+import signal
+import sys
+from app.config.settings import settings
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+from app.services.embedding_service import load_embedding_model, model_fingerprint
+from app.services.inference_server import InferenceServer
+
+def build_server(address: str, backend: str):
+    model = load_embedding_model(backend)
+    model.encode("warm up")
+    
+    cache = None
+    if settings.EMBEDDING_CACHE_SIZE > 0:
+        cache = EmbeddingCache(
+            max_size=settings.EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.EMBEDDING_CACHE_TTL_SECONDS,
+            path=settings.EMBEDDING_CACHE_PATH
+        )
+        cache.load()
+    
+    batcher = None
+    if settings.EMBEDDING_BATCHING_ENABLED:
+        batcher = EmbeddingBatcher(
+            model.encode,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS
+        )
+    
+    return InferenceServer(
+        address,
+        model,
+        model_fingerprint(backend),
+        cache=cache,
+        batcher=batcher,
+        authkey=settings.EMBEDDING_SERVER_AUTHKEY.encode() if settings.EMBEDDING_SERVER_AUTHKEY else None
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve embeddings to API workers over a local unix socket")
+    parser.add_argument("--address", default=settings.EMBEDDING_SERVER_ADDRESS)
+    parser.add_argument("--backend", default=settings.EMBEDDING_SERVER_BACKEND, choices=["torch", "onnx"])
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    server = build_server(args.address, args.backend)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
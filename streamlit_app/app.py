@@ -123,56 +123,65 @@ with tab1:
     
     if st.button("Search", use_container_width=True):
         if query:
-            with st.spinner("Searching through tools..."):
-                try:
-                    response = requests.post(
-                        f"{API_URL}/search/",
-                        json={"query": query, "limit": limit}
-                    )
+            try:
+                response = requests.post(
+                    f"{API_URL}/search/stream",
+                    json={"query": query, "limit": limit},
+                    stream=True
+                )
+                
+                if response.status_code == 200:
+                    col1, col2, col3 = st.columns(3)
+                    count_metric, time_metric, clock_metric = col1.empty(), col2.empty(), col3.empty()
+                    st.markdown("---")
+                    results_area = st.empty()
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.markdown(f"""<div class="metric-container">
-                                <h3>{data['result_count']}</h3>
-                                <p>Results Found</p>
-                            </div>""", unsafe_allow_html=True)
-                        with col2:
-                            st.markdown(f"""<div class="metric-container">
-                                <h3>{data['response_time_ms']}ms</h3>
-                                <p>Response Time</p>
-                            </div>""", unsafe_allow_html=True)
-                        with col3:
-                            st.markdown(f"""<div class="metric-container">
-                                <h3>{datetime.now().strftime('%H:%M')}</h3>
-                                <p>Search Time</p>
-                            </div>""", unsafe_allow_html=True)
-                        
-                        st.markdown("---")
-                        
-                        if data['results']:
-                            for idx, result in enumerate(data['results'], 1):
-                                st.markdown(f"""
-                                <div class="result-card">
-                                    <h3 style="color: #e94560; margin: 0;">#{idx} {result['name']}</h3>
-                                    <p style="color: #cbd5e1; margin: 0.5rem 0;">{result['description']}</p>
-                                    <div style="margin: 1rem 0;">
-                                        {''.join([f'<span class="tag-badge">{tag}</span>' for tag in result['tags']])}
-                                    </div>
-                                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                                        <span style="color: #94a3b8; font-size: 0.9rem;">Relevance Score</span>
-                                        <span style="color: #e94560; font-weight: 700; font-size: 1.2rem;">{result['score']:.4f}</span>
+                    with st.spinner("Searching through tools..."):
+                        for line in response.iter_lines():
+                            if not line:
+                                continue
+                            event = json.loads(line)
+                            
+                            if event["event"] in ("skeleton", "results"):
+                                cards = []
+                                for idx, result in enumerate(event["results"], 1):
+                                    description = result.get("description")
+                                    tags = result.get("tags") or []
+                                    cards.append(f"""
+                                    <div class="result-card">
+                                        <h3 style="color: #e94560; margin: 0;">#{idx} {result['name'] or result['id']}</h3>
+                                        <p style="color: #cbd5e1; margin: 0.5rem 0;">{description if description is not None else 'Loading details...'}</p>
+                                        <div style="margin: 1rem 0;">
+                                            {''.join([f'<span class="tag-badge">{tag}</span>' for tag in tags])}
+                                        </div>
+                                        <div style="display: flex; justify-content: space-between; align-items: center;">
+                                            <span style="color: #94a3b8; font-size: 0.9rem;">Relevance Score</span>
+                                            <span style="color: #e94560; font-weight: 700; font-size: 1.2rem;">{result['score']:.4f}</span>
+                                        </div>
                                     </div>
-                                </div>
-                                """, unsafe_allow_html=True)
-                        else:
-                            st.info("No results found. Try a different query.")
-                    else:
-                        st.error("Search failed. Please try again.")
-                except Exception as e:
-                    st.error(f"Connection error: {str(e)}")
+                                    """)
+                                if cards:
+                                    results_area.markdown("".join(cards), unsafe_allow_html=True)
+                                elif event["event"] == "results":
+                                    results_area.info("No results found. Try a different query.")
+                                count_metric.markdown(f"""<div class="metric-container">
+                                    <h3>{len(event['results'])}</h3>
+                                    <p>Results Found</p>
+                                </div>""", unsafe_allow_html=True)
+                            
+                            elif event["event"] == "timing":
+                                time_metric.markdown(f"""<div class="metric-container">
+                                    <h3>{event['response_time_ms']}ms</h3>
+                                    <p>Response Time</p>
+                                </div>""", unsafe_allow_html=True)
+                                clock_metric.markdown(f"""<div class="metric-container">
+                                    <h3>{datetime.now().strftime('%H:%M')}</h3>
+                                    <p>Search Time</p>
+                                </div>""", unsafe_allow_html=True)
+                else:
+                    st.error("Search failed. Please try again.")
+            except Exception as e:
+                st.error(f"Connection error: {str(e)}")
         else:
             st.warning("Please enter a search query")
 
@@ -1,37 +1,20 @@
-from sqlalchemy.orm import Session
-from app.database.postgres import SessionLocal
-from app.models.tool import Tool
+import asyncio
+from app.database.postgres import AsyncSessionLocal
 from app.services.embedding_service import embedding_service
-from app.services.qdrant_service import qdrant_service
+from app.services.ingestion_service import ingestion_pipeline
+from app.services.vector_backend import vector_store
 
-def sync_tools_to_qdrant():
-    db = SessionLocal()
-    try:
-        tools = db.query(Tool).filter(Tool.vector_id == None).all()
-        
-        print(f"Found {len(tools)} tools without vector embeddings")
-        
-        for tool in tools:
-            combined_text = f"{tool.name} {tool.description} {' '.join(tool.tags)}"
-            embedding = embedding_service.generate_embedding(combined_text)
-            
-            payload = {
-                "id": str(tool.id),
-                "name": tool.name,
-                "description": tool.description,
-                "tags": tool.tags
-            }
-            
-            vector_id = qdrant_service.insert_vector(embedding, payload)
-            tool.vector_id = vector_id
-            db.commit()
-            
-            print(f"Synced: {tool.name}")
-        
-        print("Sync complete!")
+def print_progress(stats):
+    print(f"Synced {stats}")
+
+async def sync_tools_to_qdrant():
+    async with AsyncSessionLocal() as db:
+        stats = await ingestion_pipeline.sync_pending_tools(db, progress=print_progress)
         
-    finally:
-        db.close()
+        print(f"Sync complete! {stats}")
+    
+    embedding_service.shutdown()
+    await vector_store.close()
 
 if __name__ == "__main__":
-    sync_tools_to_qdrant()
\ No newline at end of file
+    asyncio.run(sync_tools_to_qdrant())
\ No newline at end of file
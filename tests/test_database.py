@@ -0,0 +1,23 @@
+import asyncio
+from app.database import postgres
+
+
+def test_warm_up_pool_closes_connections_when_some_fail(monkeypatch):
+    closed = []
+
+    class Connection:
+        async def close(self):
+            closed.append(self)
+
+    class Engine:
+        attempts = 0
+
+        async def connect(self):
+            self.attempts += 1
+            if self.attempts == 2:
+                raise ConnectionError("too many clients")
+            return Connection()
+
+    monkeypatch.setattr(postgres, "async_engine", Engine())
+    asyncio.run(postgres.warm_up_pool(size=3))
+    assert len(closed) == 2
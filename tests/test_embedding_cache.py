@@ -0,0 +1,22 @@
+import json
+import numpy as np
+from app.services.embedding_cache import EmbeddingCache
+
+
+def test_embedding_cache_round_trip(tmp_path):
+    cache = EmbeddingCache(max_size=10, path=str(tmp_path / "cache"))
+    cache.set("hello world", "model", [1.0, 2.0])
+    cache.save()
+
+    restored = EmbeddingCache(max_size=10, path=str(tmp_path / "cache"))
+    restored.load()
+    assert restored.get("hello  world", "model") == [1.0, 2.0]
+
+
+def test_embedding_cache_discards_mismatched_snapshot(tmp_path):
+    keys = [{"model": "model", "text": text, "expires_at": 0} for text in ("a", "b")]
+    np.savez(tmp_path / "cache.npz", vectors=np.ones((1, 2), dtype=np.float32), keys=np.array(json.dumps(keys)))
+
+    cache = EmbeddingCache(max_size=10, path=str(tmp_path / "cache"))
+    cache.load()
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,115 @@
+import os
+import socket
+import stat
+import threading
+import time
+import numpy as np
+import pytest
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener
+from app.services.inference_server import InferenceServer, RemoteEncoder, prepare_socket_path
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, texts):
+        self.calls += 1
+        if isinstance(texts, str):
+            return np.full(4, len(texts), dtype=np.float32)
+        return np.stack([np.full(4, len(text), dtype=np.float32) for text in texts])
+
+
+def start_server(address: str, authkey: bytes = b"secret"):
+    server = InferenceServer(address, CountingModel(), "test-model:4", authkey=authkey)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        time.sleep(0.05)
+    return server
+
+
+def test_remote_encoder_round_trip(tmp_path):
+    address = str(tmp_path / "run" / "embeddings.sock")
+    start_server(address)
+
+    encoder = RemoteEncoder(address, authkey=b"secret", expected_fingerprint="test-model:4")
+    assert encoder.encode("abc").tolist() == [3, 3, 3, 3]
+    assert encoder.encode(["a", "abcd"]).shape == (2, 4)
+    with pytest.raises(RuntimeError):
+        RemoteEncoder(address, authkey=b"secret", expected_fingerprint="other-model:4").encode("abc")
+    encoder.close()
+
+
+def test_bad_authkey_does_not_stop_server(tmp_path):
+    address = str(tmp_path / "run" / "embeddings.sock")
+    start_server(address)
+
+    with pytest.raises(AuthenticationError):
+        RemoteEncoder(address, authkey=b"wrong").encode("abc")
+    encoder = RemoteEncoder(address, authkey=b"secret")
+    assert encoder.encode("abc").tolist() == [3, 3, 3, 3]
+    encoder.close()
+
+
+def test_server_requires_authkey_and_private_socket(tmp_path):
+    with pytest.raises(ValueError):
+        InferenceServer(str(tmp_path / "embeddings.sock"), CountingModel(), "test-model:4")
+    with pytest.raises(ValueError):
+        RemoteEncoder(str(tmp_path / "embeddings.sock"))
+
+    address = str(tmp_path / "run" / "embeddings.sock")
+    start_server(address)
+    assert stat.S_IMODE(os.stat(os.path.dirname(address)).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+    with pytest.raises(RuntimeError):
+        prepare_socket_path(address)
+
+
+def test_prepare_socket_path_only_removes_stale_sockets(tmp_path):
+    directory = tmp_path / "run"
+    directory.mkdir(mode=0o700)
+    address = str(directory / "embeddings.sock")
+
+    with open(address, "w"):
+        pass
+    with pytest.raises(RuntimeError):
+        prepare_socket_path(address)
+    os.unlink(address)
+
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(address)
+    stale.close()
+    prepare_socket_path(address)
+    assert not os.path.exists(address)
+
+    os.chmod(directory, 0o755)
+    with pytest.raises(RuntimeError):
+        prepare_socket_path(address)
+
+
+def test_remote_encoder_reports_info_errors(tmp_path):
+    directory = tmp_path / "run"
+    directory.mkdir(mode=0o700)
+    address = str(directory / "embeddings.sock")
+    listener = Listener(address, family="AF_UNIX", authkey=b"secret")
+    closed = []
+
+    def answer_with_error():
+        with listener.accept() as connection:
+            connection.recv()
+            connection.send(("error", "model not loaded"))
+            try:
+                connection.recv()
+            except EOFError:
+                closed.append(True)
+
+    thread = threading.Thread(target=answer_with_error, daemon=True)
+    thread.start()
+    with pytest.raises(RuntimeError, match="model not loaded"):
+        RemoteEncoder(address, authkey=b"secret", expected_fingerprint="test-model:4").encode("abc")
+    thread.join(5)
+    listener.close()
+    assert closed
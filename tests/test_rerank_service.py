@@ -0,0 +1,44 @@
+import asyncio
+import threading
+from app.services.rerank_service import RerankService
+
+
+class BlockingModel:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict(self, pairs):
+        self.release.wait(5)
+        return [float(len(text)) for _, text in pairs]
+
+
+def make_results(count: int):
+    return [{"id": str(index), "name": f"tool {index}", "description": "x" * index, "tags": []} for index in range(count)]
+
+
+def test_rerank_timeout_returns_first_stage_order():
+    service = RerankService()
+    service._model = BlockingModel()
+    service.ready = True
+    service.timeout = 0.05
+    service.max_pending = 1
+    results = make_results(4)
+
+    async def run():
+        ranked, reranked = await service.rerank("query", results, 2)
+        assert not reranked
+        assert ranked == results[:2]
+        assert service.timeouts == 1
+
+        ranked, reranked = await service.rerank("other query", results, 2)
+        assert not reranked
+        assert service.skipped == 1
+
+        service._model.release.set()
+        await asyncio.sleep(0.1)
+        ranked, reranked = await service.rerank("query", results, 2)
+        assert reranked
+        assert [result["id"] for result in ranked] == ["3", "2"]
+
+    asyncio.run(run())
+    service.shutdown()
@@ -1,10 +1,13 @@
-from fastapi.testclient import TestClient
-from app.main import app
+import json
+import time
+from uuid import UUID
+from sqlalchemy import delete
+from app.database.postgres import AsyncSessionLocal
+from app.models.tool import Tool
+from app.services.lexical_index import lexical_index
 
-client = TestClient(app)
 
-
-def test_search_tools():
+def test_search_tools(client):
     search_data = {
         "query": "machine learning",
         "limit": 5
@@ -15,11 +18,131 @@ def test_search_tools():
     assert "response_time_ms" in response.json()
 
 
-def test_search_with_custom_limit():
+def test_search_with_filters(client):
+    search_data = {
+        "query": "database",
+        "limit": 10,
+        "filters": {
+            "tags_any": ["database", "nosql"],
+            "metadata": {"category": "database"}
+        }
+    }
+    response = client.post("/search/", json=search_data)
+    assert response.status_code == 200
+    for result in response.json()["results"]:
+        assert result["metadata"]["category"] == "database"
+        assert set(result["tags"]) & {"database", "nosql"}
+
+
+def test_search_hybrid_and_lexical_modes(client):
+    tool_id = client.post("/tools/", json={
+        "name": "Quokkaflux",
+        "description": "Zebraplume orchestration toolkit",
+        "tags": ["zebraplume"]
+    }).json()["id"]
+    for mode in ("hybrid", "lexical"):
+        response = client.post("/search/", json={"query": "zebraplume", "limit": 5, "mode": mode})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) <= 5
+        assert tool_id in [result["id"] for result in results]
+
+
+def test_lexical_search_unavailable_while_index_loads(client):
+    lexical_index.ready = False
+    try:
+        response = client.post("/search/", json={"query": "index still loading", "mode": "lexical"})
+        assert response.status_code == 503
+        response = client.post("/search/", json={"query": "index still loading", "mode": "hybrid"})
+        assert response.status_code == 200
+    finally:
+        lexical_index.ready = True
+
+
+def test_search_limit_out_of_range(client):
+    for limit in (0, 10_000):
+        response = client.post("/search/", json={"query": "database", "limit": limit})
+        assert response.status_code == 422
+        response = client.post("/search/stream", json={"query": "database", "limit": limit})
+        assert response.status_code == 422
+        response = client.post("/search/batch", json={"searches": [{"query": "database", "limit": limit}]})
+        assert response.status_code == 422
+
+
+def test_search_with_custom_limit(client):
     search_data = {
         "query": "database",
         "limit": 10
     }
     response = client.post("/search/", json=search_data)
     assert response.status_code == 200
-    assert len(response.json()["results"]) <= 10
\ No newline at end of file
+    assert len(response.json()["results"]) <= 10
+
+
+def test_search_with_rerank(client):
+    client.post("/tools/bulk", json={"tools": [
+        {"name": "Flask", "description": "Lightweight python web framework", "tags": ["python", "web"]},
+        {"name": "Celery", "description": "Distributed task queue for python", "tags": ["python", "queue"]}
+    ]})
+    deadline = time.monotonic() + 10
+    while True:
+        response = client.post("/search/", json={"query": "python web framework", "limit": 3, "rerank": True})
+        assert response.status_code == 200
+        if response.json()["reranked"] or time.monotonic() > deadline:
+            break
+        time.sleep(0.1)
+    
+    assert response.json()["reranked"] is True
+    scores = [result["score"] for result in response.json()["results"]]
+    assert 0 < len(scores) <= 3
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_batch(client):
+    searches = [
+        {"query": "machine learning", "limit": 3},
+        {"query": "database", "limit": 2, "filters": {"metadata": {"category": "database"}}},
+        {"query": "PostgreSQL database", "limit": 2, "mode": "hybrid"},
+        {"query": "machine learning", "limit": 3}
+    ]
+    response = client.post("/search/batch", json={"searches": searches})
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["query"] for item in data["responses"]] == [search["query"] for search in searches]
+    for search, item in zip(searches, data["responses"]):
+        assert item["result_count"] <= search["limit"]
+        assert item["response_time_ms"] <= data["total_response_time_ms"]
+    assert data["responses"][0]["results"] == data["responses"][3]["results"]
+
+
+def test_search_stream(client):
+    response = client.post("/search/stream", json={"query": "streaming search for a data tool", "limit": 4})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["skeleton", "results", "timing"]
+    assert len(events[0]["results"]) <= 4
+    assert events[1]["result_count"] == len(events[1]["results"])
+    assert events[2]["response_time_ms"] >= events[2]["retrieval_ms"]
+
+
+def test_search_stream_lexical_skeleton_names(client):
+    client.post("/tools/", json={"name": "Glimmerquill", "description": "Snorkelwhisk ledger toolkit"})
+    response = client.post("/search/stream", json={"query": "snorkelwhisk", "limit": 3, "mode": "lexical"})
+    assert response.status_code == 200
+    skeleton = json.loads(response.text.splitlines()[0])
+    assert [result["name"] for result in skeleton["results"]] == ["Glimmerquill"]
+
+
+def test_lexical_refresh_drops_deleted_tools(client):
+    tool_id = client.post("/tools/", json={"name": "Vanishwidget", "description": "deleted behind the index's back"}).json()["id"]
+
+    async def delete_row_and_refresh():
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Tool).where(Tool.id == UUID(tool_id)))
+            await db.commit()
+            await lexical_index.refresh(db)
+
+    assert tool_id in lexical_index.index.doc_ids()
+    client.portal.call(delete_row_and_refresh)
+    assert tool_id not in lexical_index.index.doc_ids()
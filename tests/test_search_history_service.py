@@ -0,0 +1,12 @@
+from app.services.search_history_service import SearchHistoryWriter
+
+
+def test_record_after_stop_is_dropped():
+    writer = SearchHistoryWriter()
+    writer.stop()
+
+    writer.record("query", [{"id": "1", "score": 0.5}], 3)
+
+    assert writer._thread is None
+    assert writer.queue.empty()
+    assert writer.dropped == 1
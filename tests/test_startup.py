@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+IMPORT_TIME_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "5"))
+MODEL_MODULES = ["torch", "sentence_transformers", "onnxruntime"]
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {MODEL_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def test_app_import_within_budget():
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=Path(__file__).resolve().parents[1],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_TIME_BUDGET_SECONDS
@@ -1,10 +1,12 @@
-from fastapi.testclient import TestClient
-from app.main import app
+import asyncio
+import json
+import time
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.config.settings import settings
+from app.main import server_timing
 
-client = TestClient(app)
 
-
-def test_create_tool():
+def test_create_tool(client):
     tool_data = {
         "name": "Test Tool",
         "description": "A test tool for testing",
@@ -16,13 +18,147 @@ def test_create_tool():
     assert response.json()["name"] == "Test Tool"
 
 
-def test_get_tools():
+def test_create_tools_bulk(client):
+    bulk_data = {
+        "tools": [
+            {
+                "name": f"Bulk Tool {index}",
+                "description": "A bulk-created tool for testing",
+                "tags": ["test", "bulk"],
+                "metadata": {"category": "testing"}
+            }
+            for index in range(3)
+        ]
+    }
+    response = client.post("/tools/bulk", json=bulk_data)
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+    assert len(response.json()["ids"]) == 3
+    for index, tool_id in enumerate(response.json()["ids"]):
+        assert client.get(f"/tools/{tool_id}").json()["name"] == f"Bulk Tool {index}"
+
+
+def test_get_tool_with_invalid_id(client):
+    assert client.get("/tools/not-a-uuid").status_code == 404
+    assert client.put("/tools/not-a-uuid", json={"name": "Renamed"}).status_code == 404
+    assert client.delete("/tools/not-a-uuid").status_code == 404
+
+
+def test_get_tools(client):
     response = client.get("/tools/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
 
 
-def test_health_check():
+def test_get_tools_with_cursor(client):
+    client.post("/tools/bulk", json={
+        "tools": [
+            {"name": f"Paged Tool {index}", "description": "A tool for pagination testing"}
+            for index in range(3)
+        ]
+    })
+    first_page = client.get("/tools/", params={"limit": 2, "fields": "id,name"})
+    assert first_page.status_code == 200
+    assert all(set(tool) == {"id", "name"} for tool in first_page.json())
+    
+    second_page = client.get("/tools/", params={"limit": 2, "cursor": first_page.headers["X-Next-Cursor"]})
+    assert second_page.status_code == 200
+    first_ids = {tool["id"] for tool in first_page.json()}
+    assert first_ids.isdisjoint(tool["id"] for tool in second_page.json())
+    assert client.get("/tools/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_get_tools_clamps_large_limits(client, monkeypatch):
+    monkeypatch.setattr(settings, "TOOLS_PAGE_MAX_SIZE", 2)
+    response = client.get("/tools/", params={"limit": 5000})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_export_tools(client):
+    response = client.get("/tools/export", params={"fields": "id,name"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert all(set(tool) == {"id", "name"} for tool in lines)
+    assert client.get("/tools/export", params={"fields": "secret"}).status_code == 400
+
+
+def test_tool_writes_reach_vector_store(client):
+    def search_ids():
+        response = client.post("/search/", json={
+            "query": "outbox consistency probe",
+            "limit": 5,
+            "filters": {"metadata": {"category": "outbox-probe"}}
+        })
+        return {result["id"] for result in response.json()["results"]}
+    
+    def wait_for(condition):
+        deadline = time.monotonic() + 10
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        return condition()
+    
+    tool = client.post("/tools/", json={
+        "name": "Outbox Probe",
+        "description": "outbox consistency probe",
+        "tags": ["test"],
+        "metadata": {"category": "outbox-probe"}
+    }).json()
+    assert wait_for(lambda: tool["id"] in search_ids())
+    
+    response = client.put(f"/tools/{tool['id']}", json={"metadata": {"category": "outbox-probe-updated"}})
+    assert response.status_code == 200
+    assert wait_for(lambda: tool["id"] not in search_ids())
+    
+    assert client.delete(f"/tools/{tool['id']}").status_code == 200
+
+
+def test_duplicate_tools_reuse_embeddings(client):
+    def store_hits():
+        for line in client.get("/metrics").text.splitlines():
+            if line.startswith('tool_search_cache_hits_total{cache="embedding_store"}'):
+                return float(line.split()[-1])
+        return 0.0
+    
+    hits = store_hits()
+    tool_data = {"name": "Duplicate Tool", "description": "Submitted twice", "tags": ["test"]}
+    response = client.post("/tools/bulk", json={"tools": [tool_data, tool_data]})
+    assert response.status_code == 200
+    deadline = time.monotonic() + 10
+    while store_hits() < hits + 1 and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert store_hits() >= hits + 1
+
+
+def test_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
\ No newline at end of file
+    assert response.json()["status"] == "healthy"
+
+
+def test_liveness_and_readiness(client):
+    assert client.get("/health/live").status_code == 200
+    response = client.get("/health/ready")
+    assert response.status_code in (200, 503)
+    assert set(response.json()["checks"]) == {"embedding_model", "vector_store", "lexical_index"}
+
+
+def test_metrics(client):
+    client.post("/search/", json={"query": "metrics endpoint check", "limit": 3})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert 'tool_search_stage_seconds_bucket{stage="embedding",le="+Inf"}' in response.text
+    assert 'tool_search_cache_hit_ratio{cache="search"}' in response.text
+    assert "tool_search_db_pool_connections" in response.text
+
+
+def test_server_timing_skips_streamed_responses():
+    async def respond(response):
+        async def call_next(request):
+            return response
+        return await server_timing(None, call_next)
+
+    assert "Server-Timing" in asyncio.run(respond(JSONResponse({}))).headers
+    assert "Server-Timing" not in asyncio.run(respond(StreamingResponse(iter([b"{}\n"])))).headers
@@ -0,0 +1,27 @@
+import time
+from uuid import UUID
+from sqlalchemy import select, text
+from app.database.postgres import AsyncSessionLocal
+from app.models.vector_outbox import VectorOutbox
+from app.services.embedding_store import embedding_store
+
+
+def test_failed_apply_records_attempts(client, monkeypatch):
+    async def failing_embed_tools(db, tools):
+        await db.execute(text("SELECT 1 / 0"))
+
+    async def attempts(tool_id):
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(VectorOutbox.attempts).where(VectorOutbox.tool_id == tool_id))
+
+    monkeypatch.setattr(embedding_store, "embed_tools", failing_embed_tools)
+    tool = client.post("/tools/", json={"name": "Poison Tool", "description": "fails to embed", "tags": ["test"]}).json()
+    tool_id = UUID(tool["id"])
+
+    deadline = time.monotonic() + 10
+    while not client.portal.call(attempts, tool_id) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert client.portal.call(attempts, tool_id) >= 1
+
+    monkeypatch.undo()
+    assert client.delete(f"/tools/{tool['id']}").status_code == 200
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import numpy as np
+from app.schemas.search import SearchFilters
+from app.services.memory_vector_store import InMemoryVectorStore
+
+
+def test_memory_vector_store_search_and_filters():
+    store = InMemoryVectorStore(dimension=3)
+    asyncio.run(store.upsert_vectors(
+        ["a", "b", "c"],
+        [[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0]],
+        [
+            {"id": "a", "tags": ["database"], "metadata": {"popularity": 3}},
+            {"id": "b", "tags": ["cache"], "metadata": {"popularity": 9}},
+            {"id": "c", "tags": ["database"], "metadata": {"popularity": 7}}
+        ]
+    ))
+
+    results = asyncio.run(store.search_similar([1, 0, 0], limit=2))
+    assert [point.id for point in results] == ["a", "b"]
+
+    filters = SearchFilters(tags_all=["database"], metadata_ranges={"popularity": {"gte": 5}})
+    results = asyncio.run(store.search_similar([1, 0, 0], limit=2, filters=filters))
+    assert [point.id for point in results] == ["c"]
+
+    asyncio.run(store.delete_vector("a"))
+    results = asyncio.run(store.search_similar([1, 0, 0], limit=1))
+    assert results[0].id == "b"
+
+
+def test_memory_vector_store_snapshot(tmp_path):
+    store = InMemoryVectorStore(dimension=2)
+    asyncio.run(store.upsert_vectors(["a", "b"], [[1, 0], [0, 1]], [{"id": "a"}, {"id": "b"}]))
+    store.save(str(tmp_path / "vectors"))
+
+    restored = InMemoryVectorStore(dimension=2, snapshot_path=str(tmp_path / "vectors"))
+    asyncio.run(restored.start())
+    assert len(restored) == 2
+    assert asyncio.run(restored.search_similar([0, 1], limit=1))[0].id == "b"
+
+
+def test_memory_vector_store_quantized_rescoring():
+    vectors = np.random.default_rng(0).standard_normal((500, 64))
+    point_ids = [str(index) for index in range(len(vectors))]
+    exact = InMemoryVectorStore(dimension=64)
+    exact.upsert(point_ids, vectors, [{} for _ in point_ids])
+    expected = [point.id for point in exact.search(vectors[0], limit=5)]
+
+    for quantization in ("int8", "binary"):
+        store = InMemoryVectorStore(dimension=64, quantization=quantization, oversampling=20)
+        store.upsert(point_ids, vectors, [{} for _ in point_ids])
+        results = store.search(vectors[0], limit=5)
+        assert results[0].id == "0"
+        assert [point.id for point in results] == expected
+        assert store.memory_usage()["resident_bytes"] < exact.memory_usage()["resident_bytes"] / 3
+
+
+def test_ivf_training_threshold_survives_reload(tmp_path):
+    vectors = np.random.default_rng(0).standard_normal((100, 8))
+    point_ids = [str(index) for index in range(len(vectors))]
+    store = InMemoryVectorStore(dimension=8, index_type="ivf", nlist=4)
+    store.upsert(point_ids, vectors, [{"id": point_id} for point_id in point_ids])
+    assert not store.ivf.trained
+    store.save(str(tmp_path / "vectors"))
+
+    restored = InMemoryVectorStore(dimension=8, index_type="ivf", nlist=4)
+    assert restored.load(str(tmp_path / "vectors"))
+    assert not restored.ivf.trained
+    restored.upsert([str(index) for index in range(100, 160)], vectors[:60], [{} for _ in range(60)])
+    assert restored.ivf.trained
+
+
+def test_searches_stay_consistent_during_deletes():
+    vectors = np.random.default_rng(1).standard_normal((2000, 16))
+    point_ids = [str(index) for index in range(len(vectors))]
+    store = InMemoryVectorStore(dimension=16)
+    store.upsert(point_ids, vectors, [{"id": point_id} for point_id in point_ids])
+
+    deleter = threading.Thread(target=lambda: [store.delete([point_id]) for point_id in point_ids[1:1000]])
+    deleter.start()
+    while deleter.is_alive():
+        for point in store.search(vectors[0], limit=5):
+            assert point.payload["id"] == point.id
+        assert store.search(vectors[0], limit=1)[0].id == "0"
+    deleter.join()
+    assert len(store) == 1001